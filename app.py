@@ -5,6 +5,7 @@ from datetime import datetime
 from infrastructure.firebase_client import init_firebase
 from infrastructure.firestore_repository import FirestoreRepository
 from application.round_service import RoundService
+from application.game_catalog_service import GameCatalogService
 
 st.set_page_config(page_title="MBS Game Manager", layout="wide")
 st.title("📊 MBS Game Manager")
@@ -21,6 +22,14 @@ def get_round_service():
 
 round_service = get_round_service()
 
+@st.cache_resource
+def get_catalog_service():
+    db = init_firebase()
+    repo = FirestoreRepository(db)
+    return GameCatalogService(repo)
+
+catalog_service = get_catalog_service()
+
 # =====================================================
 # DATASTORE INIT
 # =====================================================
@@ -57,6 +66,7 @@ def create_game(new_game_name, company_name, seasonal_indicator):
         company_name=company_name,
         seasonal_indicator=seasonal_indicator
     )
+    catalog_service.on_game_created(new_game_name, company_name)
 
     st.session_state["game_id"] = new_game_name
     st.session_state["company_name"] = company_name
@@ -112,24 +122,45 @@ st.divider()
 # =====================================================
 st.subheader("📂 Select Existing Game")
 
-games = ds.list_games()
+GAMES_PER_PAGE = 50
+
+c1, c2 = st.columns([5, 1])
+search = c1.text_input("Search by game or company name", key="game_search")
+
+if c2.button("🔄 Refresh"):
+    catalog_service.refresh()
+
+if search.strip():
+    games = catalog_service.search(search, limit=GAMES_PER_PAGE)
+else:
+    n_pages = max(1, -(-catalog_service.count() // GAMES_PER_PAGE))
+    page_number = 0
+    if n_pages > 1:
+        page_number = st.number_input(
+            f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1
+        ) - 1
+    games = catalog_service.page(page_number, GAMES_PER_PAGE)
 
 if games:
 
     game_options = {
-        g["game_id"]: g["game_id"]
+        g["game_id"]: (
+            f"{g['game_id']} ({g['company_name']})"
+            if g.get("company_name") else g["game_id"]
+        )
         for g in games
     }
 
     selected_game = st.selectbox(
         "Choose a game",
-        options=list(game_options.keys())
+        options=list(game_options.keys()),
+        format_func=game_options.get
     )
 
     if st.button("Load Game"):
 
         st.session_state["game_id"] = selected_game
-        st.session_state["company_name"] = ds.get_company_name(selected_game)
+        st.session_state["company_name"] = catalog_service.get_company_name(selected_game)
 
         ds.game_id = selected_game
 
@@ -0,0 +1,147 @@
+import time
+
+import pandas as pd
+
+from core.cache import game_cache
+from domain.validation import validate_round
+
+from application.panel_builder import PanelBuilder
+from application.performance_service import PerformanceService
+from application.elasticity_service import ElasticityService
+from application.share_prediction_service import SharePredictionService
+from application.potential_demand_service import DemandService
+from application.demand_forecast_service import DemandForecastService
+from application.production_optimizer_service import ProductionOptimizerService
+
+
+RANKING_METRICS = [
+    "price",
+    "product_quality",
+    "product_image",
+    "revenue",
+    "sales_volume",
+    "market_share",
+]
+
+
+class BatchAnalyticsService:
+    """
+    Every analysis of one game without a UI: validation of the
+    stored rounds, elasticity fits and share backtest, rankings,
+    demand tables, forecast and production plan.
+
+    Every step reads the same data version, so the rounds are
+    fetched once. A failing step is recorded in the "status" table
+    instead of aborting the game.
+    """
+
+    def __init__(self, repository, cache=game_cache):
+        self.repo = repository
+        self.cache = cache
+        self.panels = PanelBuilder(repository, cache)
+        self.performance = PerformanceService(repository)
+        self.elasticities = ElasticityService(cache)
+        self.predictions = SharePredictionService(repository, cache)
+        self.demand = DemandService(repository)
+        self.forecaster = DemandForecastService(repository, cache)
+        self.optimizer = ProductionOptimizerService(repository, self.forecaster)
+
+    def analyze_game(
+        self,
+        game_id: str,
+        company_name: str = None,
+        horizon: int = 4
+    ) -> dict:
+        """
+        {table name: frame}, including "status"
+        (game_id, step, ok, seconds, error).
+        """
+
+        version = self.panels.get_version(game_id)
+        rounds = self.panels.get_rounds(game_id, version)
+        company_name = company_name or self.repo.get_company_name(game_id) or ""
+        df = self.panels.get_frame(game_id, version)
+
+        steps = {
+            "validation": lambda: self.validate_history(rounds, df),
+            "elasticities": lambda: self._elasticities(df),
+            "share_backtest": lambda: self.predictions.backtest(game_id, version=version),
+            "round_summaries": lambda: self.performance.get_all_round_summaries(df),
+            "rankings": lambda: self.performance.compute_ranking_cube(
+                df, company_name, RANKING_METRICS
+            ),
+            "demand": lambda: self.demand.load_all_demand(game_id, rounds),
+            "demand_forecast": lambda: self.forecaster.forecast(
+                game_id, horizon=horizon, version=version
+            ),
+            "production_plan": lambda: self.optimizer.optimize_for_game(
+                game_id, horizon=horizon
+            ).get("plan", pd.DataFrame()),
+        }
+
+        tables = {}
+        status = []
+
+        for step, run in steps.items():
+            started = time.perf_counter()
+            error = None
+
+            try:
+                result = run()
+                tables.update(result if isinstance(result, dict) else {step: result})
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+            status.append({
+                "game_id": game_id,
+                "step": step,
+                "ok": error is None,
+                "seconds": time.perf_counter() - started,
+                "error": error,
+            })
+
+        tables["status"] = pd.DataFrame(status)
+
+        return tables
+
+    def _elasticities(self, df: pd.DataFrame) -> dict:
+        return {
+            f"elasticity_{level}": table
+            for level, table in self.elasticities.compute(df).items()
+        }
+
+    def validate_history(self, rounds, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        The pre-save checks re-run on every stored round, each
+        against the rounds before it.
+        """
+
+        reports = []
+
+        for doc in sorted(rounds, key=lambda d: d.get("round_number") or 0):
+            rnd = doc.get("round_number")
+            if rnd is None:
+                continue
+
+            df_market = df[df["round"] == rnd]
+            if df_market.empty:
+                continue
+
+            report = validate_round(
+                df_market,
+                pd.DataFrame(doc.get("net_profit", []) or []).rename(
+                    columns={"Company": "company"}
+                ),
+                pd.DataFrame(doc.get("production", []) or []),
+                pd.DataFrame(doc.get("potential_demand", []) or []),
+                round_number=rnd,
+                history=df[df["round"] < rnd]
+            )
+
+            if not report.issues.empty:
+                reports.append(report.issues.assign(round=rnd))
+
+        if not reports:
+            return pd.DataFrame()
+
+        return pd.concat(reports, ignore_index=True)
@@ -0,0 +1,48 @@
+from core.cache import game_cache
+from domain.competitor_series import CompetitorSeries
+from domain.panel import build_panel_frame
+
+from application.panel_builder import PanelBuilder
+
+
+class CompetitorService:
+    """
+    Per-game CompetitorSeries, cached per data version and
+    updated in place when a round is saved.
+    """
+
+    CACHE_NAME = "competitor_series"
+
+    def __init__(self, repository, cache=game_cache):
+        self.repo = repository
+        self.cache = cache
+        self.panels = PanelBuilder(repository, cache)
+
+    def get_store(self, game_id: str, version: int = None) -> CompetitorSeries:
+
+        version = self.panels.get_version(game_id) if version is None else version
+
+        return self.panels.get_or_compute(
+            game_id,
+            version,
+            self.CACHE_NAME,
+            lambda: CompetitorSeries.from_frame(
+                self.panels.get_frame(game_id, version)
+            )
+        )
+
+    def on_round_saved(self, game_id: str, round_doc: dict, data_version: int):
+        """
+        RoundService listener: carry the previous version's store
+        forward by upserting only the saved round into a copy; the
+        cached store may be in use by other sessions.
+        """
+
+        store = self.cache.get(game_id, data_version - 1, self.CACHE_NAME)
+
+        if store is None:
+            return
+
+        store = store.copy().upsert(build_panel_frame([round_doc]).reset_index())
+
+        self.cache.set(game_id, data_version, self.CACHE_NAME, store)
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from core.cache import game_cache
+from domain.seasonality import seasonal_factors
+
+from application.panel_builder import PanelBuilder
+
+
+class DemandForecastService:
+    """
+    Per-market seasonal trend forecasts of potential demand.
+
+    demand[r, m] = (a[m] + b[m] * r) * seasonal_factor(r)
+
+    Every round's potential_demand is deseasonalized with the game's
+    seasonal_indicator, a linear trend is fitted per market (all
+    markets at once from grouped sums) and the fitted models are
+    cached per (game, data version).
+    """
+
+    def __init__(self, repository, cache=game_cache):
+        self.repo = repository
+        self.cache = cache
+        self.panels = PanelBuilder(repository, cache)
+
+    # =====================================================
+    # HISTORY
+    # =====================================================
+    def load_history(self, rounds) -> pd.DataFrame:
+
+        rows = []
+
+        for doc in rounds:
+            rnd = doc.get("round_number")
+
+            for rec in doc.get("potential_demand", []) or []:
+                rows.append({
+                    "round": rnd,
+                    "market_id": int(rec["market_id"]),
+                    "potential_demand": float(rec["potential_demand"]),
+                })
+
+        if not rows:
+            return pd.DataFrame(
+                columns=["round", "market_id", "potential_demand"]
+            )
+
+        return (
+            pd.DataFrame(rows)
+            .dropna(subset=["round"])
+            .drop_duplicates(["round", "market_id"], keep="last")
+            .sort_values(["market_id", "round"], ignore_index=True)
+        )
+
+    # =====================================================
+    # FIT (cached)
+    # =====================================================
+    def get_models(self, game_id: str, version: int = None) -> dict:
+
+        version = self.panels.get_version(game_id) if version is None else version
+
+        def _fit():
+            docs = self.panels.get_rounds(game_id, version)
+            seasonal = self.repo.get_seasonal_indicator(game_id)
+            return self.fit(self.load_history(docs), seasonal)
+
+        return self.panels.get_or_compute(
+            game_id, version, "demand_forecast_models", _fit
+        )
+
+    def fit(self, history: pd.DataFrame, seasonal_indicator: dict) -> dict:
+        """
+        Returns per-market arrays: intercept, slope, residual SE,
+        n, mean / Sxx of the round index, last observed round.
+        """
+
+        if history.empty:
+            return {}
+
+        # a season with factor <= 0 cannot be deseasonalized; its
+        # rounds are left out of the fit instead of turning into inf
+        factors = seasonal_factors(history["round"], seasonal_indicator)
+        usable = np.isfinite(factors) & (factors > 0)
+        history = history[usable]
+
+        if history.empty:
+            return {}
+
+        r = history["round"].to_numpy(dtype=float)
+        y = history["potential_demand"].to_numpy(dtype=float) / factors[usable]
+
+        grouped = pd.DataFrame({
+            "market_id": history["market_id"].to_numpy(),
+            "r": r,
+            "y": y,
+            "rr": r * r,
+            "ry": r * y,
+        }).groupby("market_id", sort=True)
+
+        sums = grouped.sum()
+        n = grouped.size().to_numpy(dtype=float)
+
+        r_mean = sums["r"].to_numpy() / n
+        y_mean = sums["y"].to_numpy() / n
+        sxx = sums["rr"].to_numpy() - n * r_mean ** 2
+        sxy = sums["ry"].to_numpy() - n * r_mean * y_mean
+
+        # a single round (or no spread) gives a flat level
+        has_trend = (n >= 2) & (sxx > 0)
+        slope = np.where(has_trend, sxy / np.where(has_trend, sxx, 1), 0.0)
+        intercept = y_mean - slope * r_mean
+
+        markets = sums.index.to_numpy()
+        market_pos = np.searchsorted(markets, history["market_id"].to_numpy())
+
+        resid = y - (intercept[market_pos] + slope[market_pos] * r)
+        sse = np.bincount(market_pos, weights=resid ** 2, minlength=len(markets))
+
+        dof = n - 2
+        se = np.where(dof > 0, np.sqrt(sse / np.where(dof > 0, dof, 1)), np.nan)
+
+        return {
+            "markets": markets,
+            "intercept": intercept,
+            "slope": slope,
+            "se": se,
+            "n": n,
+            "r_mean": r_mean,
+            "sxx": sxx,
+            "last_round": int(r.max()),
+            "seasonal_indicator": dict(seasonal_indicator),
+        }
+
+    # =====================================================
+    # FORECAST
+    # =====================================================
+    def forecast(
+        self,
+        game_id: str,
+        horizon: int = 4,
+        level: float = 0.95,
+        version: int = None
+    ) -> pd.DataFrame:
+        """
+        Forecasts for every market and the next `horizon` rounds in
+        one call, with prediction intervals at `level`.
+        """
+
+        models = self.get_models(game_id, version)
+
+        if not models:
+            return pd.DataFrame()
+
+        future = np.arange(
+            models["last_round"] + 1,
+            models["last_round"] + 1 + horizon
+        )
+
+        return self.forecast_rounds(models, future, level)
+
+    def forecast_rounds(self, models: dict, future, level: float = 0.95):
+
+        future = np.asarray(future, dtype=float)
+        markets = models["markets"]
+
+        # (rounds, markets)
+        t = future[:, None]
+        trend = models["intercept"] + models["slope"] * t
+        factor = np.nan_to_num(
+            np.maximum(seasonal_factors(future, models["seasonal_indicator"]), 0)
+        )[:, None]
+
+        n = models["n"]
+        dof = np.maximum(n - 2, 1)
+        t_crit = stats.t.ppf(0.5 + level / 2, dof)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spread = models["se"] * np.sqrt(
+                1 + 1 / n
+                + np.where(
+                    models["sxx"] > 0,
+                    (t - models["r_mean"]) ** 2 / models["sxx"],
+                    0.0
+                )
+            )
+
+        point = np.maximum(trend * factor, 0)
+        half = np.nan_to_num(t_crit * spread * factor)
+
+        return pd.DataFrame({
+            "round": np.repeat(future.astype(int), len(markets)),
+            "market_id": np.tile(markets, len(future)),
+            "seasonal_factor": np.broadcast_to(factor, point.shape).ravel(),
+            "trend": trend.ravel(),
+            "forecast": point.ravel(),
+            "lower": np.maximum(point - half, 0).ravel(),
+            "upper": (point + half).ravel(),
+        })
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+from core.cache import game_cache
+from domain.econimetrics import coefficient_paths, run_grouped_ols
+from domain.feature_engineering import prepare_features
+
+
+ELASTICITY_NAMES = {
+    "log_price": "price",
+    "log_quality": "quality",
+    "log_marketing": "image",
+}
+
+
+class ElasticityService:
+    """
+    Share elasticities from the log-log model
+
+        log_share = c + b_p log(price) + b_q log(quality) + b_i log1p(image)
+
+    fitted per market, per round and per (round, market) in one
+    batched pass each.
+
+    Point elasticities per company use the market's fit. Shares in a
+    market sum to 100%, so the own-elasticity of a company's share is
+    b * (1 - s). For image, the log1p regressor also contributes a
+    factor image / (1 + image).
+    """
+
+    LEVELS = {
+        "market": ["market_id"],
+        "round": ["round"],
+        "round_market": ["round", "market_id"],
+    }
+
+    def __init__(self, cache=game_cache):
+        self.cache = cache
+
+    # ---------------------------
+    # FINGERPRINT
+    # ---------------------------
+    def fingerprint(self, df: pd.DataFrame) -> int:
+        cols = [
+            c for c in
+            ["company", "round", "market_id", "price",
+             "product_quality", "product_image", "market_share"]
+            if c in df.columns
+        ]
+        return int(
+            pd.util.hash_pandas_object(df[cols], index=False).sum()
+        )
+
+    # ---------------------------
+    # ONE QUERY FOR THE DASHBOARD
+    # ---------------------------
+    def get_elasticities(self, game_id: str, df: pd.DataFrame) -> dict:
+        """
+        {"market", "round", "round_market", "companies"} tables,
+        cached by (game_id, fingerprint of the input data).
+        """
+
+        return self.cache.get_or_compute(
+            game_id,
+            self.fingerprint(df),
+            "elasticities",
+            lambda: self.compute(df)
+        )
+
+    def compute(self, df: pd.DataFrame) -> dict:
+
+        if "log_share" not in df.columns:
+            df = prepare_features(df)
+
+        tables = {
+            level: self._rename(run_grouped_ols(df, keys))
+            for level, keys in self.LEVELS.items()
+        }
+
+        tables["companies"] = self.point_elasticities(df, tables["market"])
+
+        return tables
+
+    def get_coefficient_paths(
+        self,
+        game_id: str,
+        df: pd.DataFrame,
+        window: int = 3
+    ) -> pd.DataFrame:
+        """
+        Expanding and rolling-window elasticity paths over rounds,
+        long form (round, window, coefficient, value).
+        """
+
+        def _compute():
+            data = df if "log_share" in df.columns else prepare_features(df)
+
+            paths = pd.concat(
+                [
+                    coefficient_paths(data),
+                    coefficient_paths(data, window=window),
+                ],
+                ignore_index=True
+            )
+
+            if paths.empty:
+                return paths
+
+            return (
+                self._rename(paths)
+                .melt(
+                    id_vars=["round", "window"],
+                    value_vars=[
+                        f"{n}_elasticity" for n in ELASTICITY_NAMES.values()
+                    ],
+                    var_name="coefficient",
+                    value_name="value"
+                )
+            )
+
+        return self.cache.get_or_compute(
+            game_id,
+            self.fingerprint(df),
+            f"coefficient_paths_{window}",
+            _compute
+        )
+
+    def _rename(self, fits: pd.DataFrame) -> pd.DataFrame:
+        return fits.rename(columns={
+            x: f"{name}_elasticity" for x, name in ELASTICITY_NAMES.items()
+        })
+
+    def point_elasticities(
+        self,
+        df: pd.DataFrame,
+        market_fits: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Every company x round x market, vectorized: join the market
+        coefficients and scale by (1 - share).
+        """
+
+        coef_cols = [f"{n}_elasticity" for n in ELASTICITY_NAMES.values()]
+
+        out = df[["company", "round", "market_id", "market_share", "product_image"]].merge(
+            market_fits[["market_id"] + coef_cols],
+            on="market_id",
+            how="left"
+        )
+
+        share = np.clip(out["market_share"].to_numpy(float) / 100, 0, 1)
+        image = np.clip(out["product_image"].to_numpy(float), 0, None)
+        scale = 1 - share
+
+        out["price_elasticity"] = out["price_elasticity"] * scale
+        out["quality_elasticity"] = out["quality_elasticity"] * scale
+        out["image_elasticity"] = (
+            out["image_elasticity"] * scale * image / (1 + image)
+        )
+
+        return out.drop(columns=["product_image"])
@@ -0,0 +1,208 @@
+import io
+import zipfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+from core.cache import game_cache
+
+from application.panel_builder import PanelBuilder
+from application.performance_service import PerformanceService
+from application.inventory_planning_service import InventoryPlanningService
+from application.potential_demand_service import DemandService
+
+
+EXPORT_TABLES = ["panel", "round_summaries", "rankings", "production", "demand"]
+
+EXPORT_FORMATS = {
+    "parquet": ("zip", "application/zip"),
+    "csv": ("zip", "application/zip"),
+    "xlsx": (
+        "xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    ),
+}
+
+RANKING_METRICS = [
+    "price",
+    "product_quality",
+    "product_image",
+    "revenue",
+    "sales_volume",
+    "market_share",
+    "Net profit",
+]
+
+
+class ExportService:
+    """
+    Writes a game's tables to Parquet / CSV (one file per table in
+    a zip) or xlsx (one sheet per table).
+
+    A buffered export, not a streaming one: every table is built in
+    full before it is written (the panel and rounds come from the
+    shared game cache), and only the encoding runs in row chunks.
+    Writing to a path keeps one derived table in memory at a time;
+    export_bytes holds the whole finished file, since the download
+    button needs it as bytes.
+    """
+
+    def __init__(self, repository, cache=game_cache, chunk_rows: int = 5000):
+        self.repo = repository
+        self.chunk_rows = chunk_rows
+        self.panels = PanelBuilder(repository, cache)
+        self.performance = PerformanceService(repository, cache)
+        self.inventory = InventoryPlanningService(repository)
+        self.demand = DemandService(repository, cache)
+
+    # ---------------------------
+    # TABLES (one at a time, each fully built)
+    # ---------------------------
+    def iter_tables(self, game_id: str, version: int = None, tables=None):
+        """
+        Yields (name, frame) one table at a time, each table
+        complete, all read at the same data version (default: the
+        live one; the production timeline is always the live one).
+        """
+
+        tables = tables or EXPORT_TABLES
+        version = self.panels.get_version(game_id) if version is None else version
+
+        for name in tables:
+
+            if name == "panel":
+                df = self.panels.get_frame(game_id, version)
+
+            elif name == "round_summaries":
+                df = self.performance.get_all_round_summaries(
+                    self.panels.get_frame(game_id, version)
+                )
+
+            elif name == "rankings":
+                df = self.performance.rank_long(
+                    self.panels.get_frame(game_id, version),
+                    RANKING_METRICS
+                )
+
+            elif name == "production":
+                df = self.inventory.get_full_dataset(game_id)
+
+            elif name == "demand":
+                df = self.demand.load_all_demand(
+                    game_id, self.panels.get_rounds(game_id, version)
+                )
+
+            else:
+                raise ValueError(f"Unknown export table: {name}")
+
+            yield name, df
+
+    def iter_chunks(self, df: pd.DataFrame):
+        for start in range(0, len(df), self.chunk_rows):
+            yield df.iloc[start:start + self.chunk_rows]
+
+    # ---------------------------
+    # WRITERS
+    # ---------------------------
+    def export(self, game_id: str, fmt: str, out, version: int = None, tables=None) -> dict:
+        """
+        Write to `out` (path or binary file object).
+        Returns {table: rows written}.
+        """
+
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+
+        writer = {
+            "parquet": self.write_parquet,
+            "csv": self.write_csv,
+            "xlsx": self.write_xlsx,
+        }[fmt]
+
+        return writer(self.iter_tables(game_id, version, tables), out)
+
+    def export_bytes(self, game_id: str, fmt: str, version: int = None) -> bytes:
+        # the complete file in memory, for st.download_button
+        buffer = io.BytesIO()
+        self.export(game_id, fmt, buffer, version)
+        return buffer.getvalue()
+
+    def file_name(self, game_id: str, fmt: str) -> str:
+        suffix = "" if fmt == "xlsx" else f"_{fmt}"
+        return f"{game_id}{suffix}.{EXPORT_FORMATS[fmt][0]}"
+
+    def mime(self, fmt: str) -> str:
+        return EXPORT_FORMATS[fmt][1]
+
+    def write_parquet(self, tables, out) -> dict:
+
+        written = {}
+
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+            for name, df in tables:
+                if df.empty:
+                    continue
+
+                schema = pa.Schema.from_pandas(df, preserve_index=False)
+
+                with zf.open(f"{name}.parquet", "w") as fh:
+                    with pq.ParquetWriter(fh, schema) as writer:
+                        for chunk in self.iter_chunks(df):
+                            writer.write_table(
+                                pa.Table.from_pandas(
+                                    chunk, schema=schema, preserve_index=False
+                                )
+                            )
+
+                written[name] = len(df)
+
+        return written
+
+    def write_csv(self, tables, out) -> dict:
+
+        written = {}
+
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, df in tables:
+                if df.empty:
+                    continue
+
+                with zf.open(f"{name}.csv", "w") as fh:
+                    text = io.TextIOWrapper(fh, encoding="utf-8", newline="")
+                    for i, chunk in enumerate(self.iter_chunks(df)):
+                        chunk.to_csv(text, header=(i == 0), index=False)
+                    text.flush()
+                    text.detach()
+
+                written[name] = len(df)
+
+        return written
+
+    def write_xlsx(self, tables, out) -> dict:
+
+        # write-only workbooks stream rows instead of keeping cells
+        wb = Workbook(write_only=True)
+        written = {}
+
+        for name, df in tables:
+            if df.empty:
+                continue
+
+            ws = wb.create_sheet(title=name[:31])
+            ws.append([str(c) for c in df.columns])
+
+            for chunk in self.iter_chunks(df):
+                cells = chunk.astype(object).where(chunk.notna(), None)
+                for row in cells.itertuples(index=False, name=None):
+                    ws.append(row)
+
+            written[name] = len(df)
+
+        if not written:
+            wb.create_sheet(title="empty")
+
+        wb.save(out)
+
+        return written
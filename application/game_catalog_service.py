@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+
+from domain.game_catalog import CATALOG_FIELDS, GameCatalog
+
+
+# shared by every service and page in the process; held outside the
+# per-game cache so it is never evicted
+game_catalog = GameCatalog()
+
+
+class GameCatalogService:
+    """
+    Game list for the home page, loaded a page at a time with
+    cursor-paginated, field-projected reads: only the pages a user
+    actually opens are fetched (a search loads the rest once).
+    Creates and saves update it in place.
+
+    Pages follow the document id, which never changes, so a game
+    updated by another process mid-paging is still read once; the
+    catalog orders the loaded games by updated_at itself. All paging
+    state lives on the shared catalog, so every service instance
+    sees the same cursor, count and lock.
+    """
+
+    def __init__(self, repository, catalog=game_catalog, page_size: int = 50):
+        self.repo = repository
+        self.catalog = catalog
+        self.page_size = page_size
+
+    # ---------------------------
+    # LOADING
+    # ---------------------------
+    def _load_pages(self, until: int = None):
+        """
+        Fetch pages until `until` games are loaded (None: all).
+        """
+
+        with self.catalog.loading:
+            while not self.catalog.complete and (
+                until is None or len(self.catalog) < until
+            ):
+                entries, cursor = self.repo.list_games_page(
+                    self.page_size,
+                    start_after=self.catalog.cursor,
+                    fields=CATALOG_FIELDS
+                )
+
+                for entry in entries:
+                    self.catalog.upsert(**entry)
+
+                self.catalog.cursor = cursor
+                self.catalog.complete = cursor is None
+
+    def refresh(self):
+        # other processes may have created games before our cursor
+        with self.catalog.loading:
+            self.catalog.clear()
+
+    # ---------------------------
+    # READS
+    # ---------------------------
+    def page(self, number: int = 0, size: int = 50) -> list:
+        self._load_pages(until=(number + 1) * size)
+        return self.catalog.page(number, size)
+
+    def search(self, prefix: str, limit: int = 50) -> list:
+        self._load_pages()
+        return self.catalog.search(prefix, limit)
+
+    def count(self) -> int:
+
+        if self.catalog.complete:
+            return len(self.catalog)
+
+        with self.catalog.loading:
+            if self.catalog.total is None:
+                self.catalog.total = self.repo.count_games()
+
+        return max(self.catalog.total, len(self.catalog))
+
+    def get_company_name(self, game_id: str):
+        entry = self.catalog.get(game_id)
+
+        if entry is None or not entry.get("company_name"):
+            return self.repo.get_company_name(game_id)
+
+        return entry.get("company_name")
+
+    # ---------------------------
+    # UPDATES
+    # ---------------------------
+    def on_game_created(self, game_id: str, company_name: str):
+        self.catalog.add(
+            game_id,
+            company_name=company_name,
+            status="active",
+            updated_at=datetime.now(timezone.utc)
+        )
+
+    def on_round_saved(self, game_id: str, round_doc: dict, data_version: int):
+        # RoundService listener; a game not loaded yet is read with
+        # its new updated_at when its page is fetched
+        self.catalog.touch(game_id, updated_at=datetime.now(timezone.utc))
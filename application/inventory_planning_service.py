@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from firebase_admin import firestore
 
+from infrastructure.firestore_repository import production_timeline_entry
+
 
 class InventoryPlanningService:
 
@@ -12,25 +14,19 @@ class InventoryPlanningService:
     # LOAD FULL DATASET (เหมือน performance)
     # =====================================================
     def get_full_dataset(self, game_id: str) -> pd.DataFrame:
-        rows = []
 
-        rounds_ref = (
-        self.repo.db.collection("mbs_games")
-        .document(game_id)
-        .collection("rounds")
-        .order_by("round_number", direction=firestore.Query.DESCENDING)
-        .limit(1)
-        .stream()
-    )
+        # one document read: timeline is denormalized on the game doc
+        timeline = self.repo.get_production_timeline(game_id)
 
-        doc = next(rounds_ref, None)
-        data = doc.to_dict()
+        if not timeline:
+            timeline = self._load_timeline_from_latest_round(game_id)
+
+        rows = []
 
-        production_list = data.get("production", [])
-        for i in production_list:
+        for rnd, i in timeline.items():
             market_sales = i.get("fg_inventory", {})
             rows.append({
-                "round": i.get("round_number",0),
+                "round": int(rnd),
                 "production volume": i.get("production_volume", 0),
                 "capacity": i.get("next_production_capacity", 0),
                 "raw material inventory": i.get("raw_material_inventory", 0),
@@ -42,10 +38,37 @@ class InventoryPlanningService:
                 "FG market 4":market_sales.get("4", 0)
             })
 
+        if not rows:
+            return pd.DataFrame()
+
         df = pd.DataFrame(rows).sort_values("round")
 
         return df
 
+    def _load_timeline_from_latest_round(self, game_id: str) -> dict:
+        """
+        Fallback for games saved before the timeline existed.
+        """
+
+        rounds_ref = (
+            self.repo.db.collection("mbs_games")
+            .document(game_id)
+            .collection("rounds")
+            .order_by("round_number", direction=firestore.Query.DESCENDING)
+            .limit(1)
+            .stream()
+        )
+
+        doc = next(rounds_ref, None)
+
+        if doc is None:
+            return {}
+
+        return {
+            str(i.get("round_number", 0)): production_timeline_entry(i)
+            for i in doc.to_dict().get("production", [])
+        }
+
     # =====================================================
     # SNAPSHOT (เหมือน performance style)
     # =====================================================
@@ -62,6 +85,31 @@ class InventoryPlanningService:
             "capacity": float(row["capacity"]),
         }
 
+    def get_tensor_snapshot(self, tensor) -> dict:
+        """
+        get_snapshot from the newest round of the game tensor that
+        has production figures.
+        """
+
+        fg = tensor.round_metric("finished_goods_inventory_total")
+        filled = np.flatnonzero(~np.isnan(fg))
+
+        if not filled.size:
+            return None
+
+        r = filled[-1]
+
+        def value(name):
+            v = tensor.round_metric(name)[r]
+            return 0.0 if np.isnan(v) else float(v)
+
+        return {
+            "fg_inventory": value("finished_goods_inventory_total"),
+            "rm_inventory": value("raw_material_inventory"),
+            "production": value("production_volume"),
+            "capacity": value("next_production_capacity"),
+        }
+
     # =====================================================
     # PRODUCTION CALCULATION
     # =====================================================
@@ -72,33 +120,104 @@ class InventoryPlanningService:
         target_ratio: float
     ):
 
-        fg_inventory = snapshot["fg_inventory"]
-        capacity = snapshot["capacity"]
+        plan = self._plan_arrays(
+            fg_inventory=snapshot["fg_inventory"],
+            forecast_demand=forecast_demand,
+            target_ratio=target_ratio,
+            capacity=snapshot["capacity"]
+        )
+
+        return {
+            "required_production": float(plan["required_production"]),
+            "target_inventory": float(plan["target_inventory"]),
+            "utilization_pct": float(plan["utilization_pct"]),
+            "capacity_gap": float(plan["capacity_gap"]),
+            "risk": str(plan["risk"]),
+        }
 
-        target_inventory = forecast_demand * target_ratio
+    def compute_production_plan_grid(
+        self,
+        snapshot: dict,
+        forecast_demand,
+        target_ratio,
+        capacity=None,
+        grid: bool = True
+    ) -> pd.DataFrame:
+        """
+        Vectorized compute_production_plan.
+
+        grid=True evaluates every (demand, ratio, capacity)
+        combination; grid=False broadcasts the inputs element-wise
+        (e.g. one demand and ratio per market).
+        capacity defaults to the snapshot capacity.
+        """
+
+        if capacity is None:
+            capacity = snapshot["capacity"]
+
+        demand = np.atleast_1d(np.asarray(forecast_demand, dtype=float))
+        ratio = np.atleast_1d(np.asarray(target_ratio, dtype=float))
+        cap = np.atleast_1d(np.asarray(capacity, dtype=float))
+
+        if grid:
+            demand, ratio, cap = np.meshgrid(demand, ratio, cap, indexing="ij")
+        else:
+            demand, ratio, cap = np.broadcast_arrays(demand, ratio, cap)
 
-        required_production = (
-            forecast_demand + target_inventory - fg_inventory
+        plan = self._plan_arrays(
+            fg_inventory=snapshot["fg_inventory"],
+            forecast_demand=demand.ravel(),
+            target_ratio=ratio.ravel(),
+            capacity=cap.ravel()
         )
 
-        if required_production < 0:
-            required_production = 0
+        return pd.DataFrame({
+            "forecast_demand": demand.ravel(),
+            "target_ratio": ratio.ravel(),
+            "capacity": cap.ravel(),
+            **plan
+        })
+
+    def _plan_arrays(
+        self,
+        fg_inventory,
+        forecast_demand,
+        target_ratio,
+        capacity
+    ) -> dict:
+
+        forecast_demand = np.asarray(forecast_demand, dtype=float)
+        capacity = np.asarray(capacity, dtype=float)
+
+        target_inventory = forecast_demand * np.asarray(target_ratio, dtype=float)
 
-        utilization = (
-            required_production / capacity * 100
-            if capacity > 0 else 0
+        required_production = np.maximum(
+            forecast_demand + target_inventory - fg_inventory,
+            0
         )
 
+        with np.errstate(divide="ignore", invalid="ignore"):
+            utilization = np.where(
+                capacity > 0,
+                required_production / capacity * 100,
+                0.0
+            )
+
         capacity_gap = capacity - required_production
 
-        if capacity == 0:
-            risk = "NO_CAPACITY"
-        elif required_production > capacity:
-            risk = "CAPACITY_SHORTAGE"
-        elif required_production == 0:
-            risk = "NO_PRODUCTION_NEEDED"
-        else:
-            risk = "FEASIBLE"
+        risk = np.select(
+            [
+                capacity == 0,
+                required_production > capacity,
+                required_production == 0,
+            ],
+            [
+                "NO_CAPACITY",
+                "CAPACITY_SHORTAGE",
+                "NO_PRODUCTION_NEEDED",
+            ],
+            default="FEASIBLE"
+        )
 
         return {
             "required_production": required_production,
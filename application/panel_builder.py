@@ -0,0 +1,123 @@
+import pandas as pd
+
+from core.cache import game_cache
+from domain.game_tensor import GameTensor, build_game_tensor
+from domain.panel import build_panel_frame, upsert_panel_round
+
+
+class PanelBuilder:
+    """
+    Builds the canonical panel once per (game, data version)
+    and shares it through the process-wide game cache.
+    """
+
+    def __init__(self, repository, cache=game_cache):
+        self.repo = repository
+        self.cache = cache
+
+    def get_version(self, game_id: str) -> int:
+        return self.repo.get_data_version(game_id)
+
+    def get_or_compute(self, game_id: str, version: int, name: str, compute):
+        """
+        cache.get_or_compute, except a computed value is only stored
+        if the game is still at `version` afterwards: a save landing
+        mid-read must not leave newer rounds cached under the older
+        version (or the other way round).
+        """
+
+        missing = object()
+        value = self.cache.get(game_id, version, name, missing)
+
+        if value is missing:
+            value = compute()
+            if self.get_version(game_id) == version:
+                self.cache.set(game_id, version, name, value)
+
+        return value
+
+    def get_rounds(self, game_id: str, version: int = None) -> list:
+        """
+        Round documents of the game at `version` (default: the live
+        one), read once and shared by every service.
+        """
+
+        version = self.get_version(game_id) if version is None else version
+
+        return self.get_or_compute(
+            game_id,
+            version,
+            "rounds",
+            lambda: self.repo.get_all_rounds(game_id)
+        )
+
+    def get_panel(self, game_id: str, version: int = None) -> pd.DataFrame:
+        """
+        Indexed by (round, market_id, company).
+        """
+
+        version = self.get_version(game_id) if version is None else version
+
+        return self.get_or_compute(
+            game_id,
+            version,
+            "panel",
+            lambda: build_panel_frame(self.get_rounds(game_id, version))
+        )
+
+    def get_frame(self, game_id: str, version: int = None) -> pd.DataFrame:
+        """
+        Same panel with the keys as plain columns.
+        """
+
+        version = self.get_version(game_id) if version is None else version
+
+        return self.get_or_compute(
+            game_id,
+            version,
+            "panel_frame",
+            lambda: self.get_panel(game_id, version).reset_index()
+        )
+
+    def get_tensor(self, game_id: str, version: int = None) -> GameTensor:
+        """
+        Dense (round, market, company, metric) arrays of the game,
+        built straight from the round documents.
+        """
+
+        version = self.get_version(game_id) if version is None else version
+
+        return self.get_or_compute(
+            game_id,
+            version,
+            "tensor",
+            lambda: build_game_tensor(self.get_rounds(game_id, version))
+        )
+
+    def on_round_saved(self, game_id: str, round_doc: dict, data_version: int):
+        """
+        RoundService listener: carry the previous version's rounds
+        and panel forward with only the saved round replaced.
+        """
+
+        rounds = self.cache.get(game_id, data_version - 1, "rounds")
+
+        if rounds is not None:
+            rounds = sorted(
+                [
+                    doc for doc in rounds
+                    if doc.get("round_number") != round_doc.get("round_number")
+                ] + [round_doc],
+                key=lambda doc: doc.get("round_number") or 0
+            )
+            self.cache.set(game_id, data_version, "rounds", rounds)
+
+        panel = self.cache.get(game_id, data_version - 1, "panel")
+
+        if panel is None:
+            return
+
+        panel = upsert_panel_round(panel, round_doc)
+
+        self.cache.set(game_id, data_version, "panel", panel)
+        self.cache.set(game_id, data_version, "panel_frame", panel.reset_index())
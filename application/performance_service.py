@@ -1,13 +1,36 @@
+import time
+import warnings
+
 import pandas as pd
 import numpy as np
 
+from core.cache import game_cache
+from application.panel_builder import PanelBuilder
+from domain.game_tensor import GameTensor
+from domain.statistics import weighted_stats
+
+
+SUMMARY_METRICS = ["Net profit", "revenue", "sales_volume"]
+
+RANKING_METRICS = [
+    "price",
+    "product_quality",
+    "product_image",
+    "revenue",
+    "sales_volume",
+    "market_share"
+]
+
+
 class PerformanceService:
 
-    def __init__(self, repository):
+    def __init__(self, repository, cache=game_cache):
         self.repo = repository
+        self.cache = cache
+        self.panels = PanelBuilder(repository, cache)
 
     def get_full_dataset(self, game_id: str) -> pd.DataFrame:
-        df = self.repo.load_all_rounds(game_id)
+        df = self.panels.get_frame(game_id)
 
         if df.empty:
             return df
@@ -22,14 +45,84 @@ class PerformanceService:
             errors="ignore"
         )
 
-        df["revenue"] = df["price"] * df["sales_volume"]
-        
         return df
 
+    # =====================================================
+    # CACHED TABLES (per game data version)
+    # =====================================================
+    def get_ranking_tables(
+        self,
+        game_id: str,
+        company_name: str,
+        version: int = None
+    ) -> dict:
+        """
+        Every round / market table of the team performance page,
+        computed once per (game, data version, company) and indexed
+        for direct .loc lookups. compute_ms is the measured cold cost.
+        """
+
+        version = self.panels.get_version(game_id) if version is None else version
+
+        return self.panels.get_or_compute(
+            game_id,
+            version,
+            f"ranking_tables:{company_name}",
+            lambda: self._compute_ranking_tables(game_id, company_name, version)
+        )
+
+    def _compute_ranking_tables(
+        self,
+        game_id: str,
+        company_name: str,
+        version: int
+    ) -> dict:
+
+        started = time.perf_counter()
+
+        df_panel = self.panels.get_panel(game_id, version).reset_index()
+        tensor = self.panels.get_tensor(game_id, version)
+
+        df_summaries = self.get_all_round_summaries(df_panel)
+
+        tables = {
+            "summaries": df_summaries,
+            "summary_cube": self.compute_ranking_cube(
+                df_summaries,
+                company_name,
+                SUMMARY_METRICS,
+                by=["round"]
+            ).set_index(["round", "metric"]),
+            "market_cube": self.rank_cube(
+                tensor,
+                company_name,
+                RANKING_METRICS
+            ).set_index(["round", "market_id", "metric"]),
+            "trend": self.trend_from_tensor(
+                tensor,
+                company_name,
+                RANKING_METRICS
+            ),
+            "summary_wstats": self.compute_weighted_stats(
+                df_summaries,
+                SUMMARY_METRICS,
+                by=["round"]
+            ).set_index(["round", "metric"]),
+            "market_wstats": self.compute_weighted_stats(
+                df_panel,
+                RANKING_METRICS,
+                by=["round", "market_id"]
+            ).set_index(["round", "market_id", "metric"]),
+        }
+
+        tables["compute_ms"] = (time.perf_counter() - started) * 1000
+
+        return tables
+
     def get_round_summary(self, df_round: pd.DataFrame):
         df_summary = (
             df_round
-            .groupby("company", as_index=False)
+            .groupby("company", as_index=False, observed=True)
             .agg({
                 "Net profit": "mean",
                 "revenue": "sum",
@@ -60,23 +153,344 @@ class PerformanceService:
 
         return df_metric
 
+    def get_all_round_summaries(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        get_round_summary for every round at once (one row per
+        round x company).
+        """
+
+        df_summary = (
+            df
+            .groupby(["round", "company"], as_index=False, observed=True)
+            .agg({
+                "Net profit": "mean",
+                "revenue": "sum",
+                "sales_volume": "sum"
+            })
+        )
+
+        df_summary["Net profit"] = (
+            df_summary["Net profit"]
+            .replace([np.inf, -np.inf], np.nan)
+            .fillna(-1e12)
+        )
+
+        return df_summary
+
+    def rank_long(
+        self,
+        df: pd.DataFrame,
+        metrics: list,
+        by=("round", "market_id")
+    ) -> pd.DataFrame:
+        """
+        Long form (by..., company, metric, value, rank) with every
+        metric ranked inside every group in one groupby().rank() pass.
+        """
+
+        keys = list(by)
+        metrics = [m for m in metrics if m in df.columns]
+
+        df_long = df[keys + ["company"] + metrics].melt(
+            id_vars=keys + ["company"],
+            value_vars=metrics,
+            var_name="metric",
+            value_name="value"
+        )
+
+        df_long = df_long.dropna(subset=["value"])
+
+        df_long["rank"] = (
+            df_long
+            .groupby(keys + ["metric"], observed=True)["value"]
+            .rank(ascending=False, method="min")
+            .astype(int)
+        )
+
+        return df_long.sort_values(keys + ["metric", "rank"], kind="stable")
+
+    def compute_ranking_cube(
+        self,
+        df: pd.DataFrame,
+        company_name: str,
+        metrics: list,
+        by=("round", "market_id"),
+        df_long: pd.DataFrame = None
+    ) -> pd.DataFrame:
+        """
+        One row per (by..., metric) with leader, average, total,
+        our value / rank and pct vs leader / avg.
+        Replaces compute_metric_table calls in nested loops.
+        """
+
+        keys = list(by) + ["metric"]
+
+        if df_long is None:
+            df_long = self.rank_long(df, metrics, by)
+
+        grouped = df_long.groupby(keys, observed=True, sort=True)
+
+        cube = grouped["value"].agg(
+            average="mean",
+            total="sum",
+            n_companies="count"
+        )
+
+        # df_long is sorted by rank, so the first row is the leader
+        leaders = grouped[["company", "value"]].first().rename(
+            columns={"company": "leader", "value": "leader_value"}
+        )
+
+        # when we appear several times in a group (e.g. ranked over
+        # all markets) our best row counts, as in compute_metric_table
+        ours = (
+            df_long[df_long["company"] == company_name]
+            .drop_duplicates(keys)
+            .set_index(keys)[["value", "rank"]]
+            .rename(columns={"value": "our_value", "rank": "our_rank"})
+        )
+
+        cube = cube.join(leaders).join(ours)
+
+        leader_value = cube["leader_value"].to_numpy(dtype=float)
+        average = cube["average"].to_numpy(dtype=float)
+        our_value = cube["our_value"].to_numpy(dtype=float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cube["pct_vs_leader"] = np.where(
+                leader_value != 0,
+                (our_value - leader_value) / np.abs(leader_value) * 100,
+                0.0
+            )
+            cube["pct_vs_avg"] = np.where(
+                average != 0,
+                (our_value - average) / np.abs(average) * 100,
+                0.0
+            )
+
+        cube["leader"] = cube["leader"].astype(str)
+        cube["our_rank"] = cube["our_rank"].astype("Int64")
+
+        return cube.reset_index()
+
+    # =====================================================
+    # TENSOR REDUCTIONS (round x market x company arrays)
+    # =====================================================
+    def rank_cube(
+        self,
+        tensor: GameTensor,
+        company_name: str,
+        metrics: list
+    ) -> pd.DataFrame:
+        """
+        compute_ranking_cube by (round, market_id) from the game
+        tensor: every statistic is one reduction over the company axis.
+        """
+
+        R, M = len(tensor.rounds), len(tensor.markets)
+        metrics = [m for m in metrics if m in tensor.metric_pos]
+
+        parts = []
+
+        for metric in metrics:
+            data = tensor.metric(metric)
+            n = tensor.count(metric)
+            total = tensor.total(metric)
+            leader_pos, leader_value = tensor.leaders(metric)
+
+            pos = tensor.company_pos.get(company_name)
+            our_value = (
+                data[..., pos] if pos is not None
+                else np.full((R, M), np.nan)
+            )
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                average = np.where(n > 0, total / n, np.nan)
+
+            parts.append(pd.DataFrame({
+                "round": np.repeat(tensor.rounds, M),
+                "market_id": np.tile(tensor.markets, R),
+                "metric": metric,
+                "average": average.ravel(),
+                "total": total.ravel(),
+                "n_companies": n.ravel(),
+                "leader": np.asarray(tensor.companies + [None], dtype=object)[
+                    leader_pos.ravel()
+                ],
+                "leader_value": leader_value.ravel(),
+                "our_value": our_value.ravel(),
+                "our_rank": tensor.rank_of(metric, company_name).ravel(),
+            }))
+
+        if not parts:
+            return pd.DataFrame()
+
+        cube = pd.concat(parts, ignore_index=True)
+        cube = cube[cube["n_companies"] > 0]
+
+        leader_value = cube["leader_value"].to_numpy(dtype=float)
+        average = cube["average"].to_numpy(dtype=float)
+        our_value = cube["our_value"].to_numpy(dtype=float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cube["pct_vs_leader"] = np.where(
+                leader_value != 0,
+                (our_value - leader_value) / np.abs(leader_value) * 100,
+                0.0
+            )
+            cube["pct_vs_avg"] = np.where(
+                average != 0,
+                (our_value - average) / np.abs(average) * 100,
+                0.0
+            )
+
+        cube["leader"] = cube["leader"].astype(str)
+        cube["our_rank"] = cube["our_rank"].astype("Int64")
+
+        return cube.sort_values(
+            ["round", "market_id", "metric"], ignore_index=True
+        )
+
+    def top_companies(
+        self,
+        tensor: GameTensor,
+        round_number,
+        market_id,
+        metric: str,
+        n: int = 3
+    ) -> pd.DataFrame:
+        """
+        (rank, company, value) of the n best companies of one cell.
+        """
+
+        values = tensor.cell(round_number, market_id)[:, tensor.metric_pos[metric]]
+        present = np.flatnonzero(~np.isnan(values))
+
+        # stable on the company order, as rank_long
+        order = present[np.argsort(-values[present], kind="stable")][:n]
+        top = values[order]
+
+        return pd.DataFrame({
+            "rank": 1 + (values[present][None, :] > top[:, None]).sum(axis=1),
+            "company": [tensor.companies[i] for i in order],
+            "value": top,
+        })
+
+    def trend_from_tensor(
+        self,
+        tensor: GameTensor,
+        company_name: str,
+        metrics: list
+    ) -> pd.DataFrame:
+        """
+        compute_trend_table from the game tensor: the max over
+        (market, company) and over our markets of every round.
+        """
+
+        metrics = [m for m in metrics if m in tensor.metric_pos]
+        k = [tensor.metric_pos[m] for m in metrics]
+        pos = tensor.company_pos.get(company_name)
+
+        block = tensor.values[..., k]                  # (R, M, C, K)
+
+        with warnings.catch_warnings():
+            # rounds without values stay NaN until interpolated
+            warnings.simplefilter("ignore", RuntimeWarning)
+            top = np.nanmax(block, axis=(1, 2))
+            ours = (
+                np.nanmax(block[:, :, pos], axis=1) if pos is not None
+                else np.full_like(top, np.nan)
+            )
+
+        wide = pd.DataFrame(
+            np.concatenate([top, ours], axis=1),
+            index=pd.Index(tensor.rounds, name="round"),
+            columns=pd.MultiIndex.from_product(
+                [["Top Company", "Our Company"], metrics],
+                names=["series", "metric"]
+            )
+        )
+
+        if pos is None:
+            wide = wide.drop(columns="Our Company", level="series")
+
+        wide = wide.interpolate(method="linear")
+
+        trend = (
+            wide.stack(["metric", "series"], future_stack=True)
+            .rename("value")
+            .reset_index()
+        )
+
+        trend["metric"] = pd.Categorical(trend["metric"], categories=metrics)
+
+        return trend.sort_values(["metric", "series", "round"], ignore_index=True)
+
+    def compute_trend_table(
+        self,
+        df: pd.DataFrame,
+        company_name: str,
+        metrics: list
+    ) -> pd.DataFrame:
+        """
+        Long form (round, metric, series, value): the best value over
+        all markets of each round for the top company and for us,
+        gaps linearly interpolated along rounds.
+        """
+
+        metrics = [m for m in metrics if m in df.columns]
+
+        df_long = df[["round", "company"] + metrics].melt(
+            id_vars=["round", "company"],
+            var_name="metric",
+            value_name="value"
+        )
+
+        top = df_long.groupby(["round", "metric"])["value"].max()
+        ours = (
+            df_long[df_long["company"] == company_name]
+            .groupby(["round", "metric"])["value"].max()
+        )
+
+        # (round) x (metric, series): one interpolate over every column
+        wide = (
+            pd.concat({"Top Company": top, "Our Company": ours}, names=["series"])
+            .unstack(["metric", "series"])
+            .sort_index()
+            .interpolate(method="linear")
+        )
+
+        trend = (
+            wide.stack(["metric", "series"], future_stack=True)
+            .rename("value")
+            .reset_index()
+        )
+
+        trend["metric"] = pd.Categorical(trend["metric"], categories=metrics)
+
+        return trend.sort_values(["metric", "series", "round"], ignore_index=True)
+
+    def compute_weighted_stats(
+        self,
+        df: pd.DataFrame,
+        metrics: list,
+        by=None,
+        weight_col: str = "sales_volume"
+    ) -> pd.DataFrame:
+        return weighted_stats(df, metrics, weight_col=weight_col, by=by)
+
     def compute_weighted_average(
         self,
         df: pd.DataFrame,
         value_col: str,
         weight_col: str
     ):
-        df = df.dropna(subset=[value_col, weight_col])
+        stats = weighted_stats(df, [value_col], weight_col, quantiles=())
 
-        total_weight = df[weight_col].sum()
-
-        if total_weight == 0:
+        if stats.empty or stats["zero_weight"].iloc[0]:
             return 0
-        
-        return (
-            (df[value_col] * df[weight_col]).sum()
-            / total_weight
-        )
+
+        return stats["mean"].iloc[0]
     
     def to_scalar(self,value):
         if isinstance(value, pd.Series):
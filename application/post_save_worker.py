@@ -0,0 +1,184 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from core.cache import game_cache
+
+from application.panel_builder import PanelBuilder
+from application.performance_service import PerformanceService
+from application.elasticity_service import ElasticityService
+from application.share_prediction_service import SharePredictionService
+from application.strategy_cluster_service import StrategyClusterService
+from application.demand_forecast_service import DemandForecastService
+
+
+class PostSaveWorker:
+    """
+    Background warm-up after a round is saved.
+
+    RoundService listener: on_round_saved queues one job per
+    (game_id, data_version) on a small thread pool. A job fills the
+    shared caches the pages read for that version (panel, tensor,
+    ranking tables, elasticities, share model, segments, demand
+    forecast). Nothing is persisted: the caches are per process.
+
+    Jobs are idempotent: a version already queued, running or done
+    is not queued again, and every step writes to a version-keyed
+    entry. A job whose version was superseded by a newer save is
+    skipped; the newer save has its own job.
+    """
+
+    def __init__(self, repository, cache=game_cache, workers: int = 2, history: int = 50):
+        self.repo = repository
+        self.cache = cache
+        self.history = history
+
+        self.panels = PanelBuilder(repository, cache)
+        self.performance = PerformanceService(repository, cache)
+        self.elasticities = ElasticityService(cache)
+        self.predictions = SharePredictionService(repository, cache)
+        self.clusters = StrategyClusterService(repository, cache)
+        self.forecaster = DemandForecastService(repository, cache)
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="post-save")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    # ---------------------------
+    # QUEUE
+    # ---------------------------
+    def on_round_saved(self, game_id: str, round_doc: dict, data_version: int):
+        self.submit(game_id, round_doc.get("round_number"), data_version)
+
+    def submit(self, game_id: str, round_number: int, data_version: int) -> bool:
+        """
+        False when this version already has a job.
+        """
+
+        key = (game_id, data_version)
+
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job["state"] != "failed":
+                return False
+
+            self._jobs[key] = {
+                "game_id": game_id,
+                "data_version": data_version,
+                "round_number": round_number,
+                "state": "queued",
+                "submitted_at": time.time(),
+                "seconds": None,
+                "error": None,
+            }
+            self._trim()
+
+        self._pool.submit(self._run, key)
+        return True
+
+    def _trim(self):
+        # keep the newest `history` jobs for status reporting
+        finished = [
+            k for k, j in self._jobs.items()
+            if j["state"] in ("done", "skipped", "failed")
+        ]
+        for key in finished[:max(0, len(self._jobs) - self.history)]:
+            del self._jobs[key]
+
+    def _set(self, key, **fields):
+        with self._lock:
+            self._jobs[key].update(fields)
+
+    def _run(self, key):
+
+        game_id, data_version = key
+        started = time.perf_counter()
+        self._set(key, state="running")
+
+        with self._lock:
+            round_number = self._jobs[key]["round_number"]
+
+        try:
+            warmed = self.warm(game_id, round_number, data_version)
+            self._set(
+                key,
+                state="done" if warmed else "skipped",
+                seconds=time.perf_counter() - started
+            )
+        except Exception as e:
+            self._set(
+                key,
+                state="failed",
+                seconds=time.perf_counter() - started,
+                error=f"{type(e).__name__}: {e}"
+            )
+
+    # ---------------------------
+    # JOB
+    # ---------------------------
+    def warm(self, game_id: str, round_number: int, data_version: int) -> bool:
+        """
+        False when the game has already moved past data_version.
+        """
+
+        if self.panels.get_version(game_id) > data_version:
+            return False
+
+        # PanelBuilder.on_round_saved carried the panel forward to
+        # data_version, so the rounds are only read on a real miss
+        self.panels.get_panel(game_id, data_version)
+        df = self.panels.get_frame(game_id, data_version)
+        self.panels.get_tensor(game_id, data_version)
+
+        # summaries, ranking cubes, trend and weighted stats of the
+        # game's own company, as the team performance page reads them
+        company_name = self.repo.get_company_name(game_id) or ""
+        self.performance.get_ranking_tables(game_id, company_name, data_version)
+
+        # keyed by a fingerprint of the values, so pages hit it too
+        self.elasticities.get_elasticities(game_id, df)
+        self.predictions.get_model(game_id, version=data_version)
+        self.predictions.backtest(game_id, version=data_version)
+        self.clusters.get_segments(game_id, version=data_version)
+        self.forecaster.get_models(game_id, data_version)
+
+        return True
+
+    # ---------------------------
+    # STATUS
+    # ---------------------------
+    def status(self, game_id: str = None) -> pd.DataFrame:
+
+        with self._lock:
+            jobs = [
+                dict(j) for j in self._jobs.values()
+                if game_id is None or j["game_id"] == game_id
+            ]
+
+        if not jobs:
+            return pd.DataFrame()
+
+        return (
+            pd.DataFrame(jobs)
+            .sort_values("submitted_at", ascending=False, ignore_index=True)
+        )
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Block until no job is queued or running (scripts / tests).
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                busy = any(
+                    j["state"] in ("queued", "running") for j in self._jobs.values()
+                )
+            if not busy:
+                return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
@@ -1,9 +1,18 @@
+import numpy as np
 import pandas as pd
 
+from core.cache import game_cache
+from domain.seasonality import season_for_round, seasonal_factors
+
+from application.panel_builder import PanelBuilder
+
+
 class DemandService:
 
-    def __init__(self, repository):
+    def __init__(self, repository, cache=game_cache):
         self.repo = repository
+        self.cache = cache
+        self.panels = PanelBuilder(repository, cache)
 
     # =====================================================
     # LOAD MARKET RESULTS (actual + potential)
@@ -20,17 +29,92 @@ class DemandService:
         if df.empty:
             return df
 
+        return self._add_demand_metrics(df)
+
+    # =====================================================
+    # BATCH: EVERY ROUND x MARKET FROM ONE BULK READ
+    # =====================================================
+    def load_all_demand(self, game_id: str, rounds=None) -> pd.DataFrame:
+        """
+        Unsatisfied demand / lost sales for every round and market.
+        `rounds` (already-loaded round documents) skips the read.
+        """
+
+        if rounds is None:
+            rounds = self.repo.get_all_rounds(game_id)
+
+        records = [
+            {**rec, "round": doc["round_number"]}
+            for doc in rounds
+            if doc.get("round_number") is not None
+            for rec in doc.get("potential_demand", []) or []
+        ]
+
+        df = pd.DataFrame(records)
+
+        if df.empty:
+            return df
+
+        df["market_id"] = df["market_id"].astype(int)
+        df = df.sort_values(["round", "market_id"], ignore_index=True)
+
+        return self._add_demand_metrics(df)
+
+    def _add_demand_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
+
         # Derived metric: unmet demand
         df["unsatisfied_demand"] = (
             df["potential_demand"] - df["actual_sales_volume"]
         )
 
-        df["lost_sales_pct"] = (
-            df["unsatisfied_demand"] / df["potential_demand"]
-        ).fillna(0)
+        potential = df["potential_demand"].to_numpy(dtype=float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            df["lost_sales_pct"] = np.where(
+                potential != 0,
+                df["unsatisfied_demand"].to_numpy(dtype=float) / potential,
+                0.0
+            )
 
         return df
 
+    # =====================================================
+    # TENSOR: round x market tables without a frame per round
+    # =====================================================
+    def demand_matrix(self, tensor, name: str = "potential_demand") -> pd.DataFrame:
+        """
+        round x market table of a potential-demand metric, read
+        from the game tensor.
+        """
+
+        return pd.DataFrame(
+            tensor.market_metric(name),
+            index=pd.Index(tensor.rounds, name="round"),
+            columns=pd.Index(tensor.markets, name="market_id")
+        )
+
+    def lost_sales_matrix(self, tensor) -> pd.DataFrame:
+        """
+        round x market lost_sales_pct, as _add_demand_metrics.
+        Rounds without a demand table stay NaN.
+        """
+
+        potential = tensor.market_metric("potential_demand")
+        actual = tensor.market_metric("actual_sales_volume")
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lost = np.where(
+                potential != 0, (potential - actual) / potential, 0.0
+            )
+
+        lost[np.isnan(potential)] = np.nan
+
+        return pd.DataFrame(
+            lost,
+            index=pd.Index(tensor.rounds, name="round"),
+            columns=pd.Index(tensor.markets, name="market_id")
+        ).dropna(how="all")
+
     # =====================================================
     # CALCULATE POTENTIAL DEMAND (if needed)
     # =====================================================
@@ -41,28 +125,47 @@ class DemandService:
         base_demand: float
     ) -> float:
 
-        game_data = self.repo.get_game(game_id)
+        return float(
+            self.seasonally_adjusted_demand(
+                game_id, [round_number], base_demand
+            )[0]
+        )
 
-        seasonal = game_data.get("seasonal_indicator", {})
+    def seasonally_adjusted_demand(
+        self,
+        game_id: str,
+        round_numbers,
+        base_demand
+    ) -> np.ndarray:
+        """
+        base_demand x seasonal factor, broadcast over arrays of
+        rounds (e.g. one entry per (round, market) pair).
+        """
+
+        seasonal = self.get_seasonal_indicator(game_id)
+
+        return (
+            np.asarray(base_demand, dtype=float)
+            * seasonal_factors(round_numbers, seasonal)
+        )
 
-        season_key = self._map_round_to_season(round_number)
+    def get_seasonal_indicator(self, game_id: str, version: int = None) -> dict:
+        """
+        Cached per (game, data version) like every derived table, so
+        an edited or re-created game is never served a stale map.
+        """
 
-        multiplier = seasonal.get(season_key, 100) / 100
+        version = self.panels.get_version(game_id) if version is None else version
 
-        return base_demand * multiplier
+        return self.panels.get_or_compute(
+            game_id,
+            version,
+            "seasonal_indicator",
+            lambda: self.repo.get_seasonal_indicator(game_id)
+        )
 
     # =====================================================
     # ROUND → SEASON
     # =====================================================
     def _map_round_to_season(self, round_number: int) -> str:
-
-        season_index = (round_number - 1) % 4
-
-        mapping = {
-            0: "spring",
-            1: "summer",
-            2: "autumn",
-            3: "winter"
-        }
-
-        return mapping[season_index]
\ No newline at end of file
+        return season_for_round(round_number)
@@ -0,0 +1,259 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linprog
+
+from infrastructure.firestore_repository import production_timeline_entry
+from application.demand_forecast_service import DemandForecastService
+
+
+class ProductionOptimizerService:
+    """
+    Multi-round production / FG allocation plan as a linear program.
+
+    Per round t and market m:
+        a[t, m]  production allocated to market m
+        I[t, m]  ending FG inventory
+        u[t, m]  lost sales (unmet demand)
+
+        I[t, m] = I[t-1, m] + a[t, m] - (d[t, m] - u[t, m])
+        sum_m a[t, m] <= capacity[t]
+        0 <= u[t, m] <= d[t, m],  a, I >= 0
+
+    minimize  holding_cost * sum(I) + stockout_cost * sum(u)
+    """
+
+    def __init__(self, repository, forecaster=None):
+        self.repo = repository
+        self.forecaster = forecaster or DemandForecastService(repository)
+
+    # =====================================================
+    # INPUTS FROM THE GAME
+    # =====================================================
+    def get_planning_inputs(self, game_id: str, horizon: int = 8) -> dict:
+        """
+        Seasonal demand forecast for the next `horizon` rounds plus
+        the latest FG / RM / capacity snapshot. RM only constrains
+        the plan when optimize_for_game gets rm_per_unit > 0.
+        """
+
+        df_forecast = self.forecaster.forecast(game_id, horizon=horizon)
+
+        if df_forecast.empty:
+            return {}
+
+        demand_table = df_forecast.pivot(
+            index="round", columns="market_id", values="forecast"
+        )
+
+        rounds = demand_table.index.to_numpy()
+        markets = demand_table.columns.to_numpy()
+        demand = demand_table.to_numpy()
+
+        latest = self.get_latest_production(game_id, int(rounds[0]) - 1)
+        fg = latest.get("fg_inventory", {})
+
+        fg_inventory = np.array([
+            float(fg.get(str(int(m)), 0) or 0)
+            for m in markets
+        ])
+
+        return {
+            "rounds": rounds,
+            "markets": markets,
+            "demand": demand,
+            "fg_inventory": fg_inventory,
+            "rm_inventory": float(latest.get("raw_material_inventory", 0) or 0),
+            "capacity": float(latest.get("next_production_capacity", 0) or 0),
+        }
+
+    def get_latest_production(self, game_id: str, latest_round: int) -> dict:
+        """
+        Newest production timeline entry up to `latest_round`, with
+        fg_inventory keyed by market id as str (both FG schemas).
+        """
+
+        # one document read: timeline is denormalized on the game doc
+        timeline = self.repo.get_production_timeline(game_id)
+        known = [int(k) for k in timeline if int(k) <= latest_round]
+
+        if known:
+            return timeline[str(max(known))]
+
+        # games saved before the timeline existed
+        round_doc = self.repo.load_round_raw(game_id, latest_round) or {}
+        production = round_doc.get("production", []) or []
+
+        if not production:
+            return {}
+
+        return production_timeline_entry(
+            max(production, key=lambda r: r.get("round_number") or 0)
+        )
+
+    def optimize_for_game(
+        self,
+        game_id: str,
+        horizon: int = 8,
+        holding_cost: float = 1.0,
+        stockout_cost: float = 5.0,
+        rm_per_unit: float = 0.0
+    ) -> dict:
+
+        inputs = self.get_planning_inputs(game_id, horizon)
+
+        if not inputs:
+            return {}
+
+        return self.optimize(
+            demand=inputs["demand"],
+            fg_inventory=inputs["fg_inventory"],
+            capacity=inputs["capacity"],
+            holding_cost=holding_cost,
+            stockout_cost=stockout_cost,
+            rm_inventory=inputs["rm_inventory"] if rm_per_unit > 0 else None,
+            rm_per_unit=rm_per_unit,
+            rounds=inputs["rounds"],
+            markets=inputs["markets"]
+        )
+
+    # =====================================================
+    # LP
+    # =====================================================
+    def optimize(
+        self,
+        demand,
+        fg_inventory,
+        capacity,
+        holding_cost: float = 1.0,
+        stockout_cost: float = 5.0,
+        rm_inventory: float = None,
+        rm_per_unit: float = 0.0,
+        rounds=None,
+        markets=None
+    ) -> dict:
+        """
+        demand: (T, M) array; fg_inventory: (M,);
+        capacity: scalar or (T,).
+        rm_inventory / rm_per_unit add a cumulative raw-material
+        limit when both are given.
+        """
+
+        demand = np.asarray(demand, dtype=float)
+        T, M = demand.shape
+        n = T * M
+
+        fg_inventory = np.broadcast_to(
+            np.asarray(fg_inventory, dtype=float), (M,)
+        )
+        capacity = np.broadcast_to(np.asarray(capacity, dtype=float), (T,))
+
+        if rounds is None:
+            rounds = np.arange(1, T + 1)
+        if markets is None:
+            markets = np.arange(1, M + 1)
+
+        # variable blocks: [a | I | u], each T*M, row-major (t, m)
+        A_BLOCK, I_BLOCK, U_BLOCK = 0, n, 2 * n
+
+        # ---------------------------
+        # inventory balance (equality)
+        # ---------------------------
+        eye = sparse.identity(n, format="csr")
+        prev = sparse.eye(n, k=-M, format="csr")   # I[t-1, m]
+
+        A_eq = sparse.hstack([-eye, eye - prev, -eye], format="csr")
+
+        b_eq = -demand.ravel()
+        b_eq[:M] += fg_inventory
+
+        # ---------------------------
+        # capacity / raw material (inequality)
+        # ---------------------------
+        per_round = sparse.kron(
+            sparse.identity(T), np.ones((1, M)), format="csr"
+        )
+        zeros = sparse.csr_matrix((T, n))
+
+        rows = [sparse.hstack([per_round, zeros, zeros])]
+        b_ub = [capacity]
+
+        if rm_inventory is not None and rm_per_unit > 0:
+            cumulative = sparse.csr_matrix(np.tril(np.ones((T, T)))) @ per_round
+            rows.append(
+                sparse.hstack([cumulative * rm_per_unit, zeros, zeros])
+            )
+            b_ub.append(np.full(T, rm_inventory))
+
+        A_ub = sparse.vstack(rows, format="csr")
+        b_ub = np.concatenate(b_ub)
+
+        # ---------------------------
+        # objective / bounds
+        # ---------------------------
+        c = np.concatenate([
+            np.zeros(n),
+            np.full(n, holding_cost),
+            np.full(n, stockout_cost),
+        ])
+
+        bounds = np.zeros((3 * n, 2))
+        bounds[:, 1] = np.inf
+        bounds[U_BLOCK:, 1] = demand.ravel()
+
+        result = linprog(
+            c,
+            A_ub=A_ub,
+            b_ub=b_ub,
+            A_eq=A_eq,
+            b_eq=b_eq,
+            bounds=bounds,
+            method="highs"
+        )
+
+        if not result.success:
+            return {
+                "status": result.message,
+                "objective": None,
+                "plan": pd.DataFrame(),
+                "rounds": pd.DataFrame(),
+            }
+
+        x = result.x
+        alloc = x[A_BLOCK:I_BLOCK].reshape(T, M)
+        inventory = x[I_BLOCK:U_BLOCK].reshape(T, M)
+        lost = x[U_BLOCK:].reshape(T, M)
+
+        plan = pd.DataFrame({
+            "round": np.repeat(rounds, M),
+            "market_id": np.tile(markets, T),
+            "demand": demand.ravel(),
+            "allocation": alloc.ravel(),
+            "sales": (demand - lost).ravel(),
+            "lost_sales": lost.ravel(),
+            "ending_fg_inventory": inventory.ravel(),
+        })
+
+        production = alloc.sum(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            utilization = np.where(
+                capacity > 0, production / capacity * 100, 0.0
+            )
+
+        per_round_df = pd.DataFrame({
+            "round": rounds,
+            "production": production,
+            "capacity": capacity,
+            "utilization_pct": utilization,
+            "demand": demand.sum(axis=1),
+            "lost_sales": lost.sum(axis=1),
+            "ending_fg_inventory": inventory.sum(axis=1),
+        })
+
+        return {
+            "status": "optimal",
+            "objective": float(result.fun),
+            "plan": plan,
+            "rounds": per_round_df,
+        }
@@ -9,6 +9,7 @@ from domain.parsers import (
 )
 
 from domain.feature_engineering import prepare_features
+from domain.validation import RoundValidationError, validate_round
 
 
 class RoundService:
@@ -19,19 +20,26 @@ class RoundService:
 
     def __init__(self, repository):
         self.repo = repository
+        self._listeners = []
+
+    def subscribe(self, listener) -> None:
+        """
+        listener(game_id, round_doc, data_version) runs after
+        every successful save.
+        """
+        self._listeners.append(listener)
 
     # =====================================================
-    # SAVE ROUND
+    # PARSE ROUND
     # =====================================================
-    def save_round(
+    def parse_round(
         self,
-        game_id: str,
         round_number: int,
         market_blocks: Dict[str, str],
         net_profit_text: str = "",
         production_text: str = "",
         potential_demand_text: str = ""
-    ) -> None:
+    ) -> Dict[str, pd.DataFrame]:
 
         round_dfs = []
 
@@ -88,18 +96,123 @@ class RoundService:
                 potential_demand_text
             )
 
+        return {
+            "market": df_market,
+            "profit": df_profit,
+            "production": df_production,
+            "potential_demand": df_potential_demand,
+        }
+
+    # =====================================================
+    # VALIDATE ROUND (no network)
+    # =====================================================
+    def validate(
+        self,
+        round_number: int,
+        frames: Dict[str, pd.DataFrame],
+        history: pd.DataFrame = None
+    ):
+        """
+        `history` is the game's panel frame from the caller's session,
+        so validation never needs a read.
+        """
+
+        return validate_round(
+            frames["market"],
+            frames["profit"],
+            frames["production"],
+            frames["potential_demand"],
+            round_number=round_number,
+            history=history
+        )
+
+    def check_round(
+        self,
+        round_number: int,
+        market_blocks: Dict[str, str],
+        net_profit_text: str = "",
+        production_text: str = "",
+        potential_demand_text: str = "",
+        history: pd.DataFrame = None
+    ):
+        frames = self.parse_round(
+            round_number,
+            market_blocks,
+            net_profit_text,
+            production_text,
+            potential_demand_text
+        )
+        return self.validate(round_number, frames, history)
+
+    # =====================================================
+    # SAVE ROUND
+    # =====================================================
+    def save_round(
+        self,
+        game_id: str,
+        round_number: int,
+        market_blocks: Dict[str, str],
+        net_profit_text: str = "",
+        production_text: str = "",
+        potential_demand_text: str = "",
+        history: pd.DataFrame = None,
+        ignore_errors: bool = False
+    ):
+        """
+        Parse, validate, persist. Raises RoundValidationError before
+        any write when a check fails, unless ignore_errors is set.
+        Returns the round document as written.
+        """
+
+        frames = self.parse_round(
+            round_number,
+            market_blocks,
+            net_profit_text,
+            production_text,
+            potential_demand_text
+        )
+
+        report = self.validate(round_number, frames, history)
+
+        if not report.ok and not ignore_errors:
+            raise RoundValidationError(report)
+
         # -----------------------------
         # Persist
         # -----------------------------
-        self.repo.save_round(
+        round_doc, data_version = self.repo.save_round(
             game_id=game_id,
             round_number=round_number,
-            market_df=df_market,
-            profit_df=df_profit,
-            production_df=df_production,
-            potential_demand_df=df_potential_demand
+            market_df=frames["market"],
+            profit_df=frames["profit"],
+            production_df=frames["production"],
+            potential_demand_df=frames["potential_demand"]
         )
 
+        # a failing listener must not turn a saved round into an error
+        for listener in self._listeners:
+            try:
+                listener(game_id, round_doc, data_version)
+            except Exception as e:
+                print(f"Round listener failed: {e}")
+
+        return round_doc
+
+    def upsert_round(
+        self,
+        rounds_data: Dict[int, Dict[str, Any]],
+        round_doc: Dict[str, Any]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        rounds_data (round_number -> document) with the saved round
+        inserted or replaced, in round order.
+        """
+
+        merged = dict(rounds_data)
+        merged[round_doc["round_number"]] = round_doc
+
+        return dict(sorted(merged.items()))
+
     # =====================================================
     # READ METHODS
     # =====================================================
@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+
+from core.cache import game_cache
+from domain.econimetrics import fit_share_model, predict_share_model
+from domain.feature_engineering import prepare_features
+
+from application.panel_builder import PanelBuilder
+
+
+DECISION_COLUMNS = ["price", "product_quality", "product_image"]
+
+
+class SharePredictionService:
+    """
+    Next-round market share for every company in every market from
+    the FE (or pooled) log-share model, given each company's last
+    observed decisions and optional what-if overrides.
+
+    Models and backtests are cached per game version.
+    """
+
+    def __init__(self, repository, cache=game_cache):
+        self.repo = repository
+        self.cache = cache
+        self.panels = PanelBuilder(repository, cache)
+
+    # ---------------------------
+    # MODEL
+    # ---------------------------
+    def get_model(self, game_id: str, fixed_effects: bool = True, version: int = None) -> dict:
+
+        version = self.panels.get_version(game_id) if version is None else version
+
+        return self.panels.get_or_compute(
+            game_id,
+            version,
+            f"share_model_{'fe' if fixed_effects else 'pooled'}",
+            lambda: fit_share_model(
+                self._features(self.panels.get_frame(game_id, version)),
+                fixed_effects=fixed_effects
+            )
+        )
+
+    def _features(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df if "log_share" in df.columns else prepare_features(df)
+
+    # ---------------------------
+    # PREDICT
+    # ---------------------------
+    def latest_decisions(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Last observed (price, quality, image, share) per company x market.
+        """
+
+        return (
+            df.sort_values("round")
+            .drop_duplicates(["company", "market_id"], keep="last")
+            [["company", "market_id", "round", "market_share"] + DECISION_COLUMNS]
+            .rename(columns={"round": "last_round", "market_share": "last_share"})
+            .sort_values(["market_id", "company"], ignore_index=True)
+        )
+
+    def predict(
+        self,
+        game_id: str,
+        overrides: pd.DataFrame = None,
+        fixed_effects: bool = True,
+        version: int = None
+    ) -> pd.DataFrame:
+        """
+        One row per company x market. `overrides` has a company column,
+        an optional market_id column (missing = every market) and any
+        of the decision columns; NaN keeps the observed value.
+
+        predicted_share renormalizes exp(log share) to 100% per market.
+        """
+
+        version = self.panels.get_version(game_id) if version is None else version
+
+        model = self.get_model(game_id, fixed_effects, version)
+        decisions = self.latest_decisions(self.panels.get_frame(game_id, version))
+
+        if overrides is not None and not overrides.empty:
+            decisions = self.apply_overrides(decisions, overrides)
+
+        return self.predict_frame(model, decisions)
+
+    def apply_overrides(self, decisions: pd.DataFrame, overrides: pd.DataFrame) -> pd.DataFrame:
+
+        keys = ["company", "market_id"] if "market_id" in overrides else ["company"]
+        cols = [c for c in DECISION_COLUMNS if c in overrides.columns]
+
+        overrides = overrides[keys + cols].assign(
+            company=overrides["company"].astype(str)
+        )
+
+        out = decisions.assign(company=decisions["company"].astype(str)).merge(
+            overrides, on=keys, how="left", suffixes=("", "_override")
+        )
+
+        for col in cols:
+            out[col] = out[f"{col}_override"].fillna(out[col])
+
+        return out.drop(columns=[f"{c}_override" for c in cols])
+
+    def predict_frame(self, model: dict, decisions: pd.DataFrame) -> pd.DataFrame:
+
+        out = decisions.copy()
+        features = prepare_features(out.assign(market_share=1.0))
+
+        out["predicted_log_share"] = predict_share_model(model, features)
+
+        raw = np.exp(out["predicted_log_share"])
+        out["predicted_share"] = 100 * raw / raw.groupby(out["market_id"]).transform("sum")
+
+        return out
+
+    # ---------------------------
+    # BACKTEST
+    # ---------------------------
+    def backtest(self, game_id: str, fixed_effects: bool = True, version: int = None) -> pd.DataFrame:
+        """
+        For every round r after the first: fit on rounds < r, predict r
+        from its actual decisions. Error per round in log share and in
+        share points.
+        """
+
+        version = self.panels.get_version(game_id) if version is None else version
+
+        return self.panels.get_or_compute(
+            game_id,
+            version,
+            f"share_backtest_{'fe' if fixed_effects else 'pooled'}",
+            lambda: self._backtest(
+                self._features(self.panels.get_frame(game_id, version)),
+                fixed_effects
+            )
+        )
+
+    def _backtest(self, df: pd.DataFrame, fixed_effects: bool) -> pd.DataFrame:
+
+        rows = []
+        round_labels = np.sort(df["round"].unique())
+
+        for rnd in round_labels[1:]:
+
+            model = fit_share_model(df[df["round"] < rnd], fixed_effects=fixed_effects)
+            target = df[df["round"] == rnd].dropna(subset=["log_share"] + DECISION_COLUMNS)
+
+            if target.empty or np.isnan(model["beta"]).any():
+                continue
+
+            pred = self.predict_frame(model, target[["company", "market_id"] + DECISION_COLUMNS])
+            log_error = pred["predicted_log_share"].to_numpy() - target["log_share"].to_numpy()
+            share_error = pred["predicted_share"].to_numpy() - target["market_share"].to_numpy(float)
+
+            rows.append({
+                "round": int(rnd),
+                "model": model["kind"],
+                "n_obs": len(target),
+                "mae_log_share": np.abs(log_error).mean(),
+                "rmse_log_share": np.sqrt((log_error ** 2).mean()),
+                "mae_share_pts": np.abs(share_error).mean(),
+            })
+
+        return pd.DataFrame(rows)
@@ -0,0 +1,30 @@
+from core.cache import game_cache
+from domain.clustering import cluster_strategies
+
+from application.panel_builder import PanelBuilder
+
+
+class StrategyClusterService:
+    """
+    Strategy segments (price / quality / image positioning) for
+    every round and market, cached per game version and k.
+    """
+
+    def __init__(self, repository, cache=game_cache):
+        self.repo = repository
+        self.cache = cache
+        self.panels = PanelBuilder(repository, cache)
+
+    def get_segments(self, game_id: str, k: int = 3, version: int = None) -> dict:
+
+        version = self.panels.get_version(game_id) if version is None else version
+
+        return self.panels.get_or_compute(
+            game_id,
+            version,
+            f"strategy_segments_{k}",
+            lambda: cluster_strategies(
+                self.panels.get_frame(game_id, version),
+                k=k
+            )
+        )
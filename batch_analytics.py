@@ -0,0 +1,118 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from infrastructure.firebase_client import init_firebase
+from infrastructure.firestore_repository import FirestoreRepository
+from application.batch_analytics_service import BatchAnalyticsService
+from application.export_service import EXPORT_FORMATS, ExportService
+
+
+# =====================================================
+# WORKER (one Firestore client per process)
+# =====================================================
+_service = None
+
+
+def _init_worker():
+    global _service
+    _service = BatchAnalyticsService(FirestoreRepository(init_firebase()))
+
+
+def _analyze(game_id: str, horizon: int) -> dict:
+    return _service.analyze_game(game_id, horizon=horizon)
+
+
+def consolidate(results: dict):
+    """
+    (table, frame) per table name, every game stacked with a
+    leading game_id column.
+    """
+
+    names = sorted({name for tables in results.values() for name in tables})
+
+    for name in names:
+        frames = [
+            tables[name].assign(game_id=game_id)
+            for game_id, tables in sorted(results.items())
+            if name in tables and not tables[name].empty
+        ]
+
+        if not frames:
+            continue
+
+        df = pd.concat(frames, ignore_index=True)
+        yield name, df[["game_id"] + [c for c in df.columns if c != "game_id"]]
+
+
+# =====================================================
+# CLI
+# =====================================================
+# python batch_analytics.py --workers 8 --out reports
+# python batch_analytics.py --game game_2024 --format xlsx
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="Run every game analysis headless, one process per game"
+    )
+    parser.add_argument("--game", action="append", default=[], help="default: every game")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--horizon", type=int, default=4)
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="parquet")
+    parser.add_argument("--out", default="reports")
+
+    args = parser.parse_args()
+
+    repo = FirestoreRepository(init_firebase())
+    game_ids = args.game or repo.list_games()
+
+    started = time.perf_counter()
+    results = {}
+
+    # spawn: gRPC channels do not survive fork, so every worker
+    # opens its own client in _init_worker
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker
+    ) as pool:
+
+        futures = {
+            pool.submit(_analyze, game_id, args.horizon): game_id
+            for game_id in game_ids
+        }
+
+        for future in as_completed(futures):
+            game_id = futures[future]
+
+            try:
+                results[game_id] = future.result()
+            except Exception as e:
+                results[game_id] = {"status": pd.DataFrame([{
+                    "game_id": game_id, "step": "load", "ok": False,
+                    "seconds": 0.0, "error": f"{type(e).__name__}: {e}",
+                }])}
+
+            failed = int((~results[game_id]["status"]["ok"]).sum())
+            print(f"{game_id}: done, {failed} failed step(s)")
+
+    os.makedirs(args.out, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(
+        args.out,
+        f"batch_{stamp}.{EXPORT_FORMATS[args.format][0]}"
+    )
+
+    writer = ExportService(repo)
+    written = {
+        "parquet": writer.write_parquet,
+        "csv": writer.write_csv,
+        "xlsx": writer.write_xlsx,
+    }[args.format](consolidate(results), path)
+
+    print(f"{len(game_ids)} games in {time.perf_counter() - started:.1f}s -> {path}")
+    print(written)
@@ -0,0 +1,147 @@
+"""
+GameTensor vs the rounds_data dict-of-dicts the pages keep in session.
+
+    python benchmarks/bench_game_tensor.py [rounds] [companies]
+
+Memory: deep size of rounds_data vs tensor.nbytes.
+Time: leader + average of every metric for every round x market,
+the old way (DataFrame per round, compute_metric_table per market
+and metric) vs building the tensor once and reducing it; and the
+full ranking cube from the panel frame (compute_ranking_cube) vs
+from the tensor (rank_cube).
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from application.performance_service import PerformanceService
+from domain.game_tensor import build_game_tensor
+from domain.panel import build_panel_frame
+
+
+METRICS = ["price", "product_quality", "product_image",
+           "sales_volume", "market_share", "revenue"]
+
+
+def make_rounds(n_rounds: int, n_companies: int, n_markets: int = 4) -> dict:
+    rng = np.random.default_rng(0)
+    rounds = {}
+
+    for r in range(1, n_rounds + 1):
+        market_data = []
+        for m in range(1, n_markets + 1):
+            for c in range(n_companies):
+                price = float(rng.uniform(5, 9))
+                sales = float(rng.integers(50_000, 250_000))
+                market_data.append({
+                    "company": f"Team{c:03d}",
+                    "market_id": m,
+                    "round": r,
+                    "price": price,
+                    "product_quality": float(rng.uniform(0.1, 1.5)),
+                    "product_image": float(rng.uniform(0.1, 1.5)),
+                    "sales_volume": sales,
+                    "market_share": float(rng.uniform(1, 10)),
+                    "revenue": price * sales,
+                    "log_price": float(np.log(price)),
+                })
+        rounds[r] = {
+            "round_number": r,
+            "market_data": market_data,
+            "net_profit": [
+                {"company": f"Team{c:03d}", "round": r,
+                 "Net profit": float(rng.normal(1e6, 3e5))}
+                for c in range(n_companies)
+            ],
+        }
+
+    return rounds
+
+
+def deep_size(obj, seen=None) -> int:
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_size(v, seen) for v in obj)
+    return size
+
+
+def old_way(rounds_data: dict, service: PerformanceService):
+    out = []
+    for rnd, doc in rounds_data.items():
+        df_round = pd.DataFrame(doc["market_data"])
+        df_round = df_round.merge(
+            pd.DataFrame(doc["net_profit"]).drop(columns="round"),
+            on="company", how="left"
+        )
+        for market in sorted(df_round["market_id"].unique()):
+            df_market = df_round[df_round["market_id"] == market]
+            for metric in METRICS:
+                df_metric = service.compute_metric_table(df_market, metric)
+                out.append((rnd, market, metric,
+                            df_metric.iloc[0]["company"], df_metric[metric].mean()))
+    return out
+
+
+def tensor_way(rounds_data: dict):
+    tensor = build_game_tensor(rounds_data.values())
+    out = []
+    for metric in METRICS:
+        out.append((tensor.leaders(metric), tensor.mean(metric)))
+    return tensor, out
+
+
+def frame_cube(df_panel: pd.DataFrame, service: PerformanceService):
+    return service.compute_ranking_cube(df_panel, "Team000", METRICS)
+
+
+def tensor_cube(tensor, service: PerformanceService):
+    return service.rank_cube(tensor, "Team000", METRICS)
+
+
+def timed(func, *args, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    n_rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    n_companies = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    rounds_data = make_rounds(n_rounds, n_companies)
+    service = PerformanceService(None)
+
+    t_old, _ = timed(old_way, rounds_data, service)
+    t_new, (tensor, _) = timed(tensor_way, rounds_data)
+
+    df_panel = build_panel_frame(rounds_data.values()).reset_index()
+    t_frame_cube, _ = timed(frame_cube, df_panel, service)
+    t_tensor_cube, _ = timed(tensor_cube, tensor, service)
+
+    dict_bytes = deep_size(rounds_data)
+
+    print(f"game: {n_rounds} rounds x 4 markets x {n_companies} companies")
+    print(f"rounds_data dict : {dict_bytes / 1024:10,.1f} KiB")
+    print(f"GameTensor       : {tensor.nbytes / 1024:10,.1f} KiB "
+          f"({dict_bytes / tensor.nbytes:,.0f}x smaller)")
+    print(f"old per-round    : {t_old * 1000:10,.1f} ms")
+    print(f"tensor build+use : {t_new * 1000:10,.1f} ms "
+          f"({t_old / t_new:,.0f}x faster)")
+    print(f"cube from frame  : {t_frame_cube * 1000:10,.1f} ms")
+    print(f"cube from tensor : {t_tensor_cube * 1000:10,.1f} ms "
+          f"({t_frame_cube / t_tensor_cube:,.0f}x faster)")
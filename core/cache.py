@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_nbytes(value) -> int:
+    """
+    Rough in-memory size of a cached value. Frames, arrays and
+    objects exposing `nbytes` (e.g. GameTensor) are measured;
+    dicts / lists / tuples are summed; anything else counts as 0.
+    """
+
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(index=True, deep=False)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+
+    if isinstance(value, np.ndarray) or hasattr(value, "nbytes"):
+        return int(value.nbytes)
+
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v) for v in value.values())
+
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(v) for v in value)
+
+    return 0
+
+
+class VersionedCache:
+    """
+    Process-wide LRU cache keyed by (game_id, data version, name).
+
+    Entries of an older version are never read again once the
+    game's version moves, so they simply age out of the LRU.
+    Thread-safe: Streamlit serves every session from one process.
+
+    Bounded by entry count and, when max_bytes is set, by the
+    estimated size of the cached values; the least recently used
+    entries go first.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _drop(self, key):
+        del self._data[key]
+        self._total_bytes -= self._sizes.pop(key, 0)
+
+    def get(self, game_id, version, name, default=None):
+        key = (game_id, version, name)
+
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, game_id, version, name, value):
+        key = (game_id, version, name)
+
+        size = estimate_nbytes(value)
+
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+            self._data[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+
+            # the newest entry always stays, even if it alone is too big
+            while len(self._data) > 1 and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+            ):
+                self._drop(next(iter(self._data)))
+
+    def get_or_compute(self, game_id, version, name, compute):
+        missing = object()
+        value = self.get(game_id, version, name, missing)
+
+        if value is missing:
+            value = compute()
+            self.set(game_id, version, name, value)
+
+        return value
+
+    def invalidate(self, game_id, name=None):
+        with self._lock:
+            for key in list(self._data):
+                if key[0] == game_id and (name is None or key[2] == name):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+
+# shared by every service and page in the process
+game_cache = VersionedCache(max_entries=128, max_bytes=512 * 1024 ** 2)
@@ -5,11 +5,18 @@ import firebase_admin
 from io import StringIO
 from datetime import datetime
 from domain.parsers import parse_net_profit_text
+from domain.panel import build_panel_frame
+from domain.performance_store import PerformanceStore
+from core.cache import game_cache
 from firebase_admin import credentials, firestore
 
 
 class DataStore:
-    def __init__(self, game_id="current_game"):
+    def __init__(self, game_id="current_game", cache=game_cache):
+
+        # process-wide, keyed by (game_id, data_version): one fetch
+        # serves every session looking at the same game
+        self.cache = cache
 
         self.company_name = ""
         self.round_dfs = []
@@ -19,6 +26,9 @@ class DataStore:
         self.round_label_cost = []
         self.game_id = game_id
 
+        # merged market + net profit, upserted as data comes in
+        self.performance = PerformanceStore()
+
         # -------------------------
         # Firebase setup (Hybrid Version)
         # -------------------------
@@ -63,9 +73,13 @@ class DataStore:
             "seasonal_indicator": seasonal_indicator,
             "created_at": now,
             "updated_at": now,
-            "status": "active"
+            "status": "active",
+            "data_version": 0
         })
 
+        # a re-created game id must not see the old game's entries
+        self.cache.invalidate(game_id)
+
     def save_current_round(self):
 
         if not self.db:
@@ -89,12 +103,14 @@ class DataStore:
             "updated_at": datetime.utcnow()
         })
 
-        self.db.collection("mbs_games").document(self.game_id).update
-        ({
+        self.db.collection("mbs_games").document(self.game_id).update({
             "updated_at" : datetime.utcnow(),
-            
+            "data_version": firestore.Increment(1)
         })
 
+        # the version bump already hides them; free the memory now
+        self.cache.invalidate(self.game_id)
+
         print(f"Round {self.round_number} saved.")
 
     def load_round(self, round_number):
@@ -111,13 +127,19 @@ class DataStore:
         if doc.exists:
             data = doc.to_dict()
 
-            self.round_dfs = [
-                pd.DataFrame(data.get("market_data", []))
-            ]
-
+            self.round_dfs = []
             self.round_net_profit = data.get("net_profit", [])
             self.round_number = round_number
 
+            self.performance.clear()
+            self.add_round_df(
+                pd.DataFrame(data.get("market_data", [])),
+                round_number
+            )
+            self.performance.upsert_profit(
+                self._profit_frame(self.round_net_profit, round_number)
+            )
+
             print(f"Loaded round {round_number}")
         else:
             print("Round not found")
@@ -164,10 +186,37 @@ class DataStore:
         for _, row in df_profit.iterrows():
             self.round_net_profit.append({
                 "round": row["round"],
-                "company": row["Company"],
+                "company": row["company"],
                 "Net profit": row["Net profit"]
             })
 
+        self.performance.upsert_profit(
+            self._profit_frame(df_profit, round_number)
+        )
+
+    def add_round_df(self, df, round_number=None):
+
+        if df.empty:
+            return
+
+        df = df.rename(columns={"Company": "company"})
+
+        if "round" not in df.columns:
+            df["round"] = round_number if round_number is not None else self.round_number
+        if "market_id" not in df.columns:
+            df["market_id"] = 1
+
+        self.round_dfs.append(df)
+        self.performance.upsert_market(df)
+
+    def _profit_frame(self, records, round_number):
+        df = pd.DataFrame(records).rename(columns={"Company": "company"})
+        if df.empty or "Net profit" not in df.columns:
+            return pd.DataFrame()
+        if "round" not in df.columns:
+            df["round"] = round_number
+        return df
+
     def get_all_rounds_df(self):
         if not self.round_dfs:
             return pd.DataFrame()
@@ -184,96 +233,77 @@ class DataStore:
         return pd.DataFrame(self.round_potential_demand)
 
     def get_full_performance_df(self):
+        # kept merged by add_round_df / add_net_profit_text
+        return self.performance.frame()
 
-        df_main = self.get_all_rounds_df()
-        df_profit = self.get_all_rounds_net_profit()
-
-        if df_main.empty and df_profit.empty:
-            return pd.DataFrame()
-
-        if df_main.empty:
-            return df_profit
-
-        if df_profit.empty:
-            return df_main
+    def get_data_version(self, game_id=None) -> int:
 
-        df_market = (
-            pd.DataFrame(df_main)
-            .drop_duplicates(["company", "round", "market_id"])
+        doc = (
+            self.db.collection("mbs_games")
+            .document(game_id or self.game_id)
+            .get()
         )
 
-        df_profit = (
-            pd.DataFrame(df_profit)
-            .drop_duplicates(["company", "round"])
-        )
+        if not doc.exists:
+            return 0
 
-        df = pd.merge(
-            df_market,
-            df_profit,
-            on=["company", "round"],
-            how="left"
-        )
+        return int(doc.to_dict().get("data_version") or 0)
 
-        return df
-    
-    @st.cache_data(ttl=30)
-    def load_all_rounds_from_firebase(_self):
+    def load_all_rounds_from_firebase(self):
 
-        if not _self.db:
+        if not self.db:
             print("Firebase not initialized")
             return pd.DataFrame()
 
-        rounds_ref = (
-            _self.db.collection("mbs_games")
-            .document(_self.game_id)
-            .collection("rounds")
-            .stream()
-        )
+        game_id = self.game_id
 
-        all_market_data = []
-        all_profit_data = []
+        def _fetch():
+            rounds_ref = (
+                self.db.collection("mbs_games")
+                .document(game_id)
+                .collection("rounds")
+                .stream()
+            )
 
-        for doc in rounds_ref:
-            data = doc.to_dict()
+            df = build_panel_frame(doc.to_dict() for doc in rounds_ref)
 
-            market_data = data.get("market_data", [])
-            profit_data = data.get("net_profit", [])
+            if df.empty:
+                return pd.DataFrame()
 
-            all_market_data.extend(market_data)
-            all_profit_data.extend(profit_data)
+            return df.reset_index()
 
-        if not all_market_data:
-            return pd.DataFrame()
-
-        df_market = pd.DataFrame(all_market_data)
-        df_profit = pd.DataFrame(all_profit_data)
-
-        if df_profit.empty:
-            return df_market
+        # same entry PanelBuilder.get_frame uses; like PanelBuilder it
+        # is only stored if no save landed while the rounds were read
+        version = self.get_data_version(game_id)
+        df = self.cache.get(game_id, version, "panel_frame")
 
-        df = pd.merge(
-            df_market,
-            df_profit,
-            on=["company", "round"],
-            how="left"
-        )
+        if df is None:
+            df = _fetch()
+            if self.get_data_version(game_id) == version:
+                self.cache.set(game_id, version, "panel_frame", df)
 
         return df
     
     # --------------------------- # company name Handler # --------------------------- 
-    @st.cache_data
-    def get_company_name(_self, game_id: str):
-        doc = (
-            _self.db
-            .collection("mbs_games")
-            .document(game_id)
-            .get()
-        )
+    def get_company_name(self, game_id: str):
 
-        if doc.exists:
-            return doc.to_dict().get("company_name")
+        def _fetch():
+            doc = (
+                self.db
+                .collection("mbs_games")
+                .document(game_id)
+                .get()
+            )
+
+            if doc.exists:
+                return doc.to_dict().get("company_name")
+
+            return None
+
+        # fixed at creation, so not tied to the data version;
+        # create_new_game invalidates it
+        return self.cache.get_or_compute(game_id, "meta", "company_name", _fetch)
 
-        return None
     def set_company_name(self, name): 
         self.company_name = name
 
@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+
+STRATEGY_FEATURES = ["price", "product_quality", "product_image"]
+
+
+def _sq_distances(X: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    # |x|^2 - 2 x.c + |c|^2, (n, k)
+    return (
+        (X ** 2).sum(axis=1)[:, None]
+        - 2 * X @ centers.T
+        + (centers ** 2).sum(axis=1)[None, :]
+    ).clip(min=0)
+
+
+def kmeans_plus_plus(X: np.ndarray, k: int, rng) -> np.ndarray:
+    centers = np.empty((k, X.shape[1]))
+    centers[0] = X[rng.integers(len(X))]
+    d2 = _sq_distances(X, centers[:1])[:, 0]
+
+    for i in range(1, k):
+        total = d2.sum()
+        if total <= 0:
+            centers[i:] = centers[0]
+            break
+        centers[i] = X[rng.choice(len(X), p=d2 / total)]
+        d2 = np.minimum(d2, _sq_distances(X, centers[i:i + 1])[:, 0])
+
+    return centers
+
+
+def kmeans(
+    X: np.ndarray,
+    k: int,
+    n_init: int = 4,
+    max_iter: int = 100,
+    seed: int = 0
+):
+    """
+    Lloyd's k-means with k-means++ seeding, fully vectorized over
+    points and centers. Returns (labels, centers, inertia) of the
+    best of n_init runs.
+    """
+
+    X = np.asarray(X, dtype=float)
+    k = min(k, len(X))
+    rng = np.random.default_rng(seed)
+
+    best = None
+
+    for _ in range(n_init):
+        centers = kmeans_plus_plus(X, k, rng)
+
+        for _ in range(max_iter):
+            labels = _sq_distances(X, centers).argmin(axis=1)
+
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, X)
+
+            # an emptied cluster keeps its previous center
+            new_centers = np.where(
+                counts[:, None] > 0,
+                sums / np.maximum(counts, 1)[:, None],
+                centers
+            )
+
+            if np.allclose(new_centers, centers):
+                break
+            centers = new_centers
+
+        d2 = _sq_distances(X, centers)
+        labels = d2.argmin(axis=1)
+        inertia = d2[np.arange(len(X)), labels].sum()
+
+        if best is None or inertia < best[2]:
+            best = (labels, centers, inertia)
+
+    return best
+
+
+def cluster_strategies(
+    df: pd.DataFrame,
+    k: int = 3,
+    features: list = None,
+    seed: int = 0
+) -> dict:
+    """
+    Segment companies by positioning inside every (round, market).
+
+    Features are z-scored per market over the whole game, so a
+    segment means the same thing in every round. Segment ids are then
+    matched round to round (Hungarian assignment on centers), so a
+    company keeping its strategy keeps its segment id.
+
+    Returns {"assignments", "centers", "transitions"} frames.
+    """
+
+    features = list(features or STRATEGY_FEATURES)
+
+    data = df[["company", "round", "market_id"] + features].dropna()
+    data = data.sort_values(["market_id", "round"], ignore_index=True)
+
+    assignments = []
+    centers_rows = []
+
+    for market, df_market in data.groupby("market_id", sort=True):
+
+        values = df_market[features].to_numpy(dtype=float)
+        mean = values.mean(axis=0)
+        std = values.std(axis=0)
+        std[std == 0] = 1
+        Z = (values - mean) / std
+
+        rounds = df_market["round"].to_numpy()
+        prev_centers = None
+
+        for rnd in np.unique(rounds):
+            rows = np.flatnonzero(rounds == rnd)
+            labels, centers, _ = kmeans(Z[rows], k, seed=seed)
+
+            # relabel to best match the previous round's segments
+            if prev_centers is not None and len(centers) == len(prev_centers):
+                cost = _sq_distances(centers, prev_centers)
+                _, mapping = linear_sum_assignment(cost)
+                labels = mapping[labels]
+                reordered = np.empty_like(centers)
+                reordered[mapping] = centers
+                centers = reordered
+            elif prev_centers is None:
+                # first round: order segments by price
+                order = np.argsort(centers[:, 0])
+                rank = np.empty_like(order)
+                rank[order] = np.arange(len(order))
+                labels = rank[labels]
+                centers = centers[order]
+
+            prev_centers = centers
+
+            block = df_market.iloc[rows][["company", "round", "market_id"] + features].copy()
+            block["segment"] = labels + 1
+            assignments.append(block)
+
+            raw = centers * std + mean
+            sizes = np.bincount(labels, minlength=len(centers))
+            for s in range(len(centers)):
+                centers_rows.append({
+                    "round": rnd,
+                    "market_id": market,
+                    "segment": s + 1,
+                    "size": int(sizes[s]),
+                    **{f: raw[s, j] for j, f in enumerate(features)},
+                })
+
+    if not assignments:
+        empty = pd.DataFrame()
+        return {"assignments": empty, "centers": empty, "transitions": empty}
+
+    df_assign = pd.concat(assignments, ignore_index=True)
+
+    return {
+        "assignments": df_assign,
+        "centers": pd.DataFrame(centers_rows),
+        "transitions": segment_transitions(df_assign),
+    }
+
+
+def segment_transitions(df_assign: pd.DataFrame) -> pd.DataFrame:
+    """
+    Company moves between segments from each round to the next one
+    it appears in, per market.
+    """
+
+    df = df_assign[["company", "market_id", "round", "segment"]].sort_values(
+        ["market_id", "company", "round"], ignore_index=True
+    )
+
+    grouped = df.groupby(["market_id", "company"], sort=False, observed=True)
+    df["next_round"] = grouped["round"].shift(-1)
+    df["next_segment"] = grouped["segment"].shift(-1)
+
+    moves = df.dropna(subset=["next_round"]).astype({
+        "next_round": int, "next_segment": int
+    })
+
+    return (
+        moves
+        .groupby(
+            ["market_id", "round", "next_round", "segment", "next_segment"],
+            as_index=False,
+            observed=True
+        )
+        .agg(companies=("company", "count"))
+        .rename(columns={"segment": "from_segment", "next_segment": "to_segment"})
+    )
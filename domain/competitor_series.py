@@ -0,0 +1,194 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+SERIES_METRICS = [
+    "price",
+    "product_quality",
+    "product_image",
+    "sales_volume",
+    "market_share",
+    "Net profit",
+]
+
+
+class CompetitorSeries:
+    """
+    Every company's metrics in one company-major array
+
+        values[company, market, round, metric]
+
+    so one company's full trajectory is a contiguous block
+    (values[c]) found through a dict lookup, and a cross-company
+    comparison is a single strided slice (values[:, m, r, k]).
+
+    Rounds and companies grow in place with amortized doubling,
+    so saving a round only writes that round's cells.
+    """
+
+    def __init__(self, metrics=None):
+        self.metrics = list(metrics or SERIES_METRICS)
+        self.companies = []
+        self.markets = []
+        self.rounds = []
+
+        self._company_pos = {}
+        self._market_pos = {}
+        self._round_pos = {}
+
+        self.values = np.full((0, 0, 0, len(self.metrics)), np.nan)
+
+    # ---------------------------
+    # BUILD / UPDATE
+    # ---------------------------
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, metrics=None):
+        """
+        df: flat panel frame (company, round, market_id, metrics...).
+        """
+        store = cls(metrics)
+        store.upsert(df)
+        return store
+
+    def copy(self):
+        """
+        Independent store (labels and values), e.g. to update a
+        shared store without touching readers of the original.
+        """
+        other = type(self)(self.metrics)
+        other.companies = list(self.companies)
+        other.markets = list(self.markets)
+        other.rounds = list(self.rounds)
+        other._company_pos = dict(self._company_pos)
+        other._market_pos = dict(self._market_pos)
+        other._round_pos = dict(self._round_pos)
+        other.values = self.values.copy()
+        return other
+
+    def upsert(self, df: pd.DataFrame):
+        """
+        Insert or replace the rows of df (typically one round).
+        """
+
+        if df.empty:
+            return self
+
+        companies = df["company"].astype(str).to_numpy()
+        markets = df["market_id"].astype(int).to_numpy()
+        rounds = df["round"].astype(int).to_numpy()
+
+        c_idx = self._positions(companies, self.companies, self._company_pos)
+        m_idx = self._positions(markets, self.markets, self._market_pos)
+        r_idx = self._positions(rounds, self.rounds, self._round_pos)
+
+        self._ensure_capacity()
+
+        cols = [m for m in self.metrics if m in df.columns]
+        k_idx = [self.metrics.index(m) for m in cols]
+
+        # a re-saved round replaces the old cells of that round
+        for r in np.unique(r_idx):
+            self.values[:, :, r, :] = np.nan
+
+        block = df[cols].to_numpy(dtype=float)
+        self.values[c_idx[:, None], m_idx[:, None], r_idx[:, None], k_idx] = block
+
+        return self
+
+    def _positions(self, labels, ordered, positions) -> np.ndarray:
+        out = np.empty(len(labels), dtype=np.int64)
+
+        for i, label in enumerate(labels.tolist()):
+            pos = positions.get(label)
+            if pos is None:
+                pos = len(ordered)
+                positions[label] = pos
+                ordered.append(label)
+            out[i] = pos
+
+        return out
+
+    def _ensure_capacity(self):
+        need = (len(self.companies), len(self.markets), len(self.rounds))
+        have = self.values.shape[:3]
+
+        if all(n <= h for n, h in zip(need, have)):
+            return
+
+        shape = tuple(
+            h if n <= h else max(n, 2 * h)
+            for n, h in zip(need, have)
+        ) + (len(self.metrics),)
+
+        grown = np.full(shape, np.nan)
+        grown[:have[0], :have[1], :have[2]] = self.values
+        self.values = grown
+
+    # ---------------------------
+    # READ
+    # ---------------------------
+    def _view(self) -> np.ndarray:
+        return self.values[
+            :len(self.companies), :len(self.markets), :len(self.rounds)
+        ]
+
+    def _round_order(self) -> np.ndarray:
+        return np.argsort(self.rounds, kind="stable")
+
+    def trajectory(self, company: str, market=None) -> pd.DataFrame:
+        """
+        One company's full history, long by (market, round).
+        """
+
+        pos = self._company_pos.get(company)
+
+        if pos is None:
+            return pd.DataFrame(columns=["market_id", "round"] + self.metrics)
+
+        order = self._round_order()
+        block = self._view()[pos][:, order]          # (markets, rounds, metrics)
+        markets = np.asarray(self.markets)
+        rounds = np.asarray(self.rounds)[order]
+
+        if market is not None:
+            m = self._market_pos[int(market)]
+            block = block[m:m + 1]
+            markets = markets[m:m + 1]
+
+        df = pd.DataFrame(
+            block.reshape(-1, len(self.metrics)),
+            columns=self.metrics
+        )
+        df.insert(0, "round", np.tile(rounds, len(markets)))
+        df.insert(0, "market_id", np.repeat(markets, len(rounds)))
+
+        return df.dropna(how="all", subset=self.metrics).reset_index(drop=True)
+
+    def compare(self, metric: str, market=None) -> pd.DataFrame:
+        """
+        company x round table of one metric (one market, or summed
+        over markets for volumes / averaged for the rest).
+        """
+
+        k = self.metrics.index(metric)
+        order = self._round_order()
+        data = self._view()[:, :, order, k]          # (companies, markets, rounds)
+
+        if market is not None:
+            table = data[:, self._market_pos[int(market)], :]
+        elif metric in ("sales_volume",):
+            table = np.nansum(data, axis=1)
+            table[np.all(np.isnan(data), axis=1)] = np.nan
+        else:
+            with warnings.catch_warnings():
+                # all-NaN rows (company absent that round) stay NaN
+                warnings.simplefilter("ignore", RuntimeWarning)
+                table = np.nanmean(data, axis=1)
+
+        return pd.DataFrame(
+            table,
+            index=pd.Index(self.companies, name="company"),
+            columns=pd.Index(np.asarray(self.rounds)[order], name="round")
+        )
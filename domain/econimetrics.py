@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import statsmodels.api as sm
 from linearmodels.panel import PanelOLS
@@ -54,4 +55,224 @@ def reestimate_all(round_dfs: list):
     if df_all["round"].nunique() >= 2:
         fe = run_fixed_effects(df_all)
 
-    return df_all, pooled, fe
\ No newline at end of file
+    return df_all, pooled, fe
+
+
+LOG_REGRESSORS = ["log_price", "log_quality", "log_marketing"]
+
+
+def _design(df: pd.DataFrame, y: str, x: list):
+    """
+    Clean rows -> (X with constant, y) as float arrays.
+    """
+
+    cols = [y] + list(x)
+    data = df[cols].replace([np.inf, -np.inf], np.nan)
+    keep = data.notna().all(axis=1).to_numpy()
+
+    X = np.column_stack([np.ones(keep.sum()), data.loc[keep, x].to_numpy(float)])
+    return X, data.loc[keep, y].to_numpy(float), keep
+
+
+def grouped_sufficient_stats(
+    df: pd.DataFrame,
+    group_cols: list,
+    y: str = "log_share",
+    x: list = None
+):
+    """
+    Per-group X'X, X'y, y'y, sum(y) and n for OLS with a constant,
+    from one sort and np.add.reduceat.
+
+    Returns (groups frame, XtX (G,k,k), Xty (G,k), yty (G,), sy (G,), n (G,)).
+    """
+
+    x = list(x or LOG_REGRESSORS)
+    X, Y, keep = _design(df, y, x)
+
+    keys = df.loc[keep, group_cols]
+    grouped = keys.groupby(group_cols, sort=True, observed=True)
+    codes = grouped.ngroup().to_numpy()
+    groups = grouped.size().index.to_frame(index=False)
+
+    if len(codes) == 0:
+        k = len(x) + 1
+        return (groups, np.zeros((0, k, k)), np.zeros((0, k)),
+                np.zeros(0), np.zeros(0), np.zeros(0))
+
+    order = np.argsort(codes, kind="stable")
+    codes, X, Y = codes[order], X[order], Y[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+    XtX = np.add.reduceat(np.einsum("ni,nj->nij", X, X), starts, axis=0)
+    Xty = np.add.reduceat(X * Y[:, None], starts, axis=0)
+    yty = np.add.reduceat(Y * Y, starts)
+    sy = np.add.reduceat(Y, starts)
+    n = np.diff(np.r_[starts, len(codes)]).astype(float)
+
+    return groups, XtX, Xty, yty, sy, n
+
+
+def solve_sufficient_stats(XtX, Xty, yty, sy, n, names: list) -> pd.DataFrame:
+    """
+    Batched OLS from sufficient statistics. Groups with fewer
+    observations than parameters + 1 (or a singular X'X) get NaN.
+    """
+
+    G, k, _ = XtX.shape
+    beta = np.full((G, k), np.nan)
+
+    ok = n > k
+    if ok.any():
+        # pinv keeps collinear groups (e.g. one price level) finite
+        beta[ok] = np.einsum(
+            "gij,gj->gi", np.linalg.pinv(XtX[ok]), Xty[ok]
+        )
+
+    # SSE = y'y - 2 b'X'y + b'X'X b ; SST = y'y - n * ybar^2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sse = (
+            yty
+            - 2 * np.einsum("gi,gi->g", beta, Xty)
+            + np.einsum("gi,gij,gj->g", beta, XtX, beta)
+        )
+        sst = yty - sy ** 2 / n
+        r2 = np.where(sst > 0, 1 - sse / sst, np.nan)
+
+    out = pd.DataFrame(beta, columns=["const"] + list(names))
+    out["n_obs"] = n.astype(int)
+    out["r2"] = r2
+
+    return out
+
+
+def run_grouped_ols(
+    df: pd.DataFrame,
+    group_cols: list,
+    y: str = "log_share",
+    x: list = None
+) -> pd.DataFrame:
+    """
+    run_pooled_ols for every group at once (one row per group).
+    """
+
+    x = list(x or LOG_REGRESSORS)
+
+    groups, XtX, Xty, yty, sy, n = grouped_sufficient_stats(df, group_cols, y, x)
+    fits = solve_sufficient_stats(XtX, Xty, yty, sy, n, x)
+
+    return pd.concat([groups, fits], axis=1)
+
+
+def coefficient_paths(
+    df: pd.DataFrame,
+    window: int = None,
+    y: str = "log_share",
+    x: list = None
+) -> pd.DataFrame:
+    """
+    Pooled OLS coefficients on rounds 1..r (expanding) or on the
+    last `window` rounds (rolling) for every round r.
+
+    Per-round sufficient statistics are computed once. Windows are
+    prefix sums (expanding) or differences of prefix sums (adding
+    round r, removing round r - window), so the whole path is O(R)
+    instead of R refits.
+    """
+
+    x = list(x or LOG_REGRESSORS)
+
+    groups, XtX, Xty, yty, sy, n = grouped_sufficient_stats(df, ["round"], y, x)
+
+    if len(groups) == 0:
+        return pd.DataFrame()
+
+    stats = [XtX, Xty, yty, sy, n]
+    prefix = [np.cumsum(s, axis=0) for s in stats]
+
+    if window is None:
+        window_stats = prefix
+    else:
+        window_stats = []
+        for p in prefix:
+            shifted = np.zeros_like(p)
+            shifted[window:] = p[:-window]
+            window_stats.append(p - shifted)
+
+    out = solve_sufficient_stats(*window_stats, x)
+    out.insert(0, "round", groups["round"].to_numpy())
+    out.insert(1, "window", "expanding" if window is None else f"rolling {window}")
+
+    return out
+
+
+def fit_share_model(
+    df: pd.DataFrame,
+    fixed_effects: bool = True,
+    y: str = "log_share",
+    x: list = None
+) -> dict:
+    """
+    Closed-form pooled OLS, or the within (company fixed effects)
+    estimator run_fixed_effects fits, kept for prediction.
+
+    Returns {"kind", "names", "beta" (k,), "const", "effects"} where
+    effects maps company -> intercept (FE only; unseen companies
+    use const, the mean effect). Falls back to pooled when no
+    company has two observations.
+    """
+
+    x = list(x or LOG_REGRESSORS)
+    X, Y, keep = _design(df, y, x)
+    X = X[:, 1:]
+    companies = df.loc[keep, "company"].astype(str).to_numpy()
+
+    if fixed_effects and len(Y):
+        codes, uniques = pd.factorize(companies)
+        counts = np.bincount(codes)
+        fixed_effects = (counts >= 2).any()
+
+    if not len(Y):
+        return {
+            "kind": "pooled", "names": x,
+            "beta": np.full(len(x), np.nan), "const": np.nan, "effects": {}
+        }
+
+    if not fixed_effects:
+        A = np.column_stack([np.ones(len(Y)), X])
+        coef, *_ = np.linalg.lstsq(A, Y, rcond=None)
+        return {
+            "kind": "pooled", "names": x,
+            "beta": coef[1:], "const": float(coef[0]), "effects": {}
+        }
+
+    # demean within company, then alpha_i = ybar_i - xbar_i' b
+    x_mean = np.zeros((len(uniques), X.shape[1]))
+    np.add.at(x_mean, codes, X)
+    x_mean /= counts[:, None]
+    y_mean = np.bincount(codes, weights=Y) / counts
+
+    beta, *_ = np.linalg.lstsq(X - x_mean[codes], Y - y_mean[codes], rcond=None)
+    alpha = y_mean - x_mean @ beta
+
+    return {
+        "kind": "fixed_effects", "names": x,
+        "beta": beta, "const": float(alpha.mean()),
+        "effects": dict(zip(uniques, alpha)),
+    }
+
+
+def predict_share_model(model: dict, df: pd.DataFrame) -> np.ndarray:
+    """
+    Predicted log share for every row in one matrix multiply.
+    """
+
+    X = df[model["names"]].to_numpy(float)
+    intercept = (
+        df["company"].astype(str)
+        .map(model["effects"])
+        .fillna(model["const"])
+        .to_numpy(float)
+    )
+
+    return intercept + X @ model["beta"]
@@ -0,0 +1,173 @@
+import threading
+from bisect import bisect_left
+from datetime import datetime, timezone
+
+
+CATALOG_FIELDS = ["company_name", "updated_at", "status"]
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _as_utc(value):
+    # Firestore returns aware datetimes, older code wrote naive UTC
+    if not isinstance(value, datetime):
+        return _EPOCH
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class GameCatalog:
+    """
+    In-memory list of games with
+
+        order   game ids, most recently updated first
+        keys    sorted (lowercase key, game_id) for game ids and
+                company names, searched by prefix with bisect
+
+    Both are rebuilt lazily after upserts. Thread-safe: one
+    catalog serves every session.
+
+    `cursor` / `complete` / `total` are the paging state of whoever
+    fills it: the opaque position of the next page to load, whether
+    every game has been loaded, and the server-side game count (None
+    until read). `loading` serializes page loads across every
+    service sharing the catalog.
+    """
+
+    def __init__(self, entries=()):
+        self.cursor = None
+        self.complete = False
+        self.total = None
+        self.loading = threading.Lock()
+        self._entries = {}
+        self._order = []
+        self._keys = []
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        for entry in entries:
+            self._put(entry)
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _put(self, entry: dict):
+        game_id = entry["game_id"]
+        current = self._entries.get(game_id, {})
+        merged = {**current, **{k: v for k, v in entry.items() if v is not None}}
+        # a page read after an in-place update must not move it back
+        merged["updated_at"] = max(
+            _as_utc(merged.get("updated_at")),
+            _as_utc(current.get("updated_at"))
+        )
+        self._entries[game_id] = merged
+        self._dirty = True
+
+    def _rebuild(self):
+        self._order = sorted(
+            self._entries,
+            key=lambda g: self._entries[g]["updated_at"],
+            reverse=True
+        )
+
+        keys = []
+        for game_id, entry in self._entries.items():
+            keys.append((game_id.lower(), game_id))
+            company = entry.get("company_name")
+            if company:
+                keys.append((str(company).lower(), game_id))
+        keys.sort()
+
+        self._keys = keys
+        self._dirty = False
+
+    def _ensure_built(self):
+        if self._dirty:
+            self._rebuild()
+
+    # ---------------------------
+    # WRITES
+    # ---------------------------
+    def upsert(self, game_id: str, **fields):
+        with self._lock:
+            self._put({"game_id": game_id, **fields})
+
+    def add(self, game_id: str, **fields):
+        """
+        upsert a game that was just created, counting it in `total`.
+        """
+        with self._lock:
+            if game_id not in self._entries and self.total is not None:
+                self.total += 1
+            self._put({"game_id": game_id, **fields})
+
+    def touch(self, game_id: str, **fields) -> bool:
+        """
+        Update a game only if it is already loaded; a partial entry
+        for an unloaded game would count towards the loaded pages.
+        """
+        with self._lock:
+            if game_id not in self._entries:
+                return False
+            self._put({"game_id": game_id, **fields})
+            return True
+
+    def clear(self):
+        """
+        Forget every game and the paging state, e.g. to pick up
+        games created by another process.
+        """
+        with self._lock:
+            self.cursor = None
+            self.complete = False
+            self.total = None
+            self._entries = {}
+            self._dirty = True
+
+    def remove(self, game_id: str):
+        with self._lock:
+            if self._entries.pop(game_id, None) is not None:
+                self._dirty = True
+
+    # ---------------------------
+    # READS
+    # ---------------------------
+    def get(self, game_id: str) -> dict:
+        with self._lock:
+            entry = self._entries.get(game_id)
+            return dict(entry) if entry else None
+
+    def page(self, number: int = 0, size: int = 50) -> list:
+        with self._lock:
+            self._ensure_built()
+            ids = self._order[number * size:(number + 1) * size]
+            return [dict(self._entries[g]) for g in ids]
+
+    def search(self, prefix: str, limit: int = 50) -> list:
+        """
+        Games whose id or company name starts with `prefix`
+        (case-insensitive), most recently updated first.
+        """
+
+        prefix = prefix.strip().lower()
+
+        with self._lock:
+            self._ensure_built()
+
+            found = set()
+            start = bisect_left(self._keys, (prefix, ""))
+
+            for key, game_id in self._keys[start:]:
+                if not key.startswith(prefix):
+                    break
+                found.add(game_id)
+
+            matches = sorted(
+                found,
+                key=lambda g: self._entries[g]["updated_at"],
+                reverse=True
+            )[:limit]
+
+            return [dict(self._entries[g]) for g in matches]
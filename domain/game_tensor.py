@@ -0,0 +1,264 @@
+import numpy as np
+
+
+TENSOR_METRICS = [
+    "price",
+    "product_quality",
+    "product_image",
+    "sales_volume",
+    "market_share",
+    "revenue",
+    "Net profit",
+]
+
+MARKET_METRICS = [
+    "potential_demand",
+    "actual_sales_volume",
+    "finished_goods_inventory",
+    "market_share_pct",
+]
+
+ROUND_METRICS = [
+    "sales_volume",
+    "production_volume",
+    "next_production_capacity",
+    "raw_material_inventory",
+    "finished_goods_inventory_total",
+]
+
+# legacy documents use the pasted column titles
+_ALIASES = {
+    "Company": "company",
+    "Price": "price",
+    "Product quality": "product_quality",
+    "Product image": "product_image",
+    "Sales volume": "sales_volume",
+    "Market share": "market_share",
+}
+
+
+class GameTensor:
+    """
+    Dense game representation built straight from round documents:
+
+        values[round, market, company, metric]   float64, NaN = missing
+        mask[round, market, company]             company present
+        market_values[round, market, metric]     potential demand table
+        round_values[round, metric]              production / inventory
+
+    with label lists and label -> position dicts for every axis.
+    Slices are views and reductions are plain NumPy calls.
+    """
+
+    def __init__(self, rounds, markets, companies):
+        self.rounds = list(rounds)
+        self.markets = list(markets)
+        self.companies = list(companies)
+        self.metrics = list(TENSOR_METRICS)
+        self.market_metrics = list(MARKET_METRICS)
+        self.round_metrics = list(ROUND_METRICS)
+
+        self.round_pos = {r: i for i, r in enumerate(self.rounds)}
+        self.market_pos = {m: i for i, m in enumerate(self.markets)}
+        self.company_pos = {c: i for i, c in enumerate(self.companies)}
+        self.metric_pos = {k: i for i, k in enumerate(self.metrics)}
+
+        R, M, C = len(self.rounds), len(self.markets), len(self.companies)
+
+        self.values = np.full((R, M, C, len(self.metrics)), np.nan, dtype=np.float64)
+        self.mask = np.zeros((R, M, C), dtype=bool)
+        self.market_values = np.full(
+            (R, M, len(self.market_metrics)), np.nan, dtype=np.float64
+        )
+        self.round_values = np.full(
+            (R, len(self.round_metrics)), np.nan, dtype=np.float64
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self.values.nbytes
+            + self.mask.nbytes
+            + self.market_values.nbytes
+            + self.round_values.nbytes
+        )
+
+    # ---------------------------
+    # SLICES
+    # ---------------------------
+    def metric(self, name: str) -> np.ndarray:
+        """
+        (rounds, markets, companies) view of one metric.
+        """
+        return self.values[..., self.metric_pos[name]]
+
+    def cell(self, round_number, market_id) -> np.ndarray:
+        """
+        (companies, metrics) view of one round x market.
+        """
+        return self.values[
+            self.round_pos[round_number], self.market_pos[int(market_id)]
+        ]
+
+    def company(self, name: str) -> np.ndarray:
+        """
+        (rounds, markets, metrics) history of one company.
+        """
+        return self.values[:, :, self.company_pos[name]]
+
+    def market_metric(self, name: str) -> np.ndarray:
+        """
+        (rounds, markets) view of a potential-demand metric.
+        """
+        return self.market_values[..., self.market_metrics.index(name)]
+
+    def round_metric(self, name: str) -> np.ndarray:
+        """
+        (rounds,) view of a production / inventory metric.
+        """
+        return self.round_values[:, self.round_metrics.index(name)]
+
+    # ---------------------------
+    # REDUCTIONS over companies
+    # ---------------------------
+    def leaders(self, name: str):
+        """
+        Leader position and value per (round, market).
+        Cells without any company get position -1 / NaN.
+        """
+
+        data = self.metric(name)
+        filled = np.where(np.isnan(data), -np.inf, data)
+
+        pos = filled.argmax(axis=2)
+        value = np.take_along_axis(data, pos[..., None], axis=2)[..., 0]
+
+        empty = np.isnan(data).all(axis=2)
+        pos[empty] = -1
+
+        return pos, value
+
+    def rank_of(self, name: str, company: str) -> np.ndarray:
+        """
+        (rounds, markets) rank of one company, highest value first,
+        ties sharing the lowest rank (pandas method="min").
+        NaN where the company has no value.
+        """
+
+        data = self.metric(name)
+        pos = self.company_pos.get(company)
+
+        if pos is None:
+            return np.full(data.shape[:2], np.nan)
+
+        ours = data[..., pos]
+        rank = 1 + (data > ours[..., None]).sum(axis=2)
+
+        return np.where(np.isnan(ours), np.nan, rank)
+
+    def count(self, name: str) -> np.ndarray:
+        return (~np.isnan(self.metric(name))).sum(axis=2)
+
+    def total(self, name: str) -> np.ndarray:
+        return np.nansum(self.metric(name), axis=2)
+
+    def mean(self, name: str) -> np.ndarray:
+        data = self.metric(name)
+        count = (~np.isnan(data)).sum(axis=2)
+        total = np.nansum(data, axis=2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(count > 0, total / count, np.nan)
+
+    def weighted_mean(self, name: str, weight: str = "sales_volume") -> np.ndarray:
+        data = self.metric(name)
+        w = np.nan_to_num(self.metric(weight))
+        w = np.where(np.isnan(data), 0.0, w)
+
+        sw = w.sum(axis=2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                sw > 0,
+                (np.nan_to_num(data) * w).sum(axis=2) / sw,
+                np.nan
+            )
+
+
+def build_game_tensor(rounds) -> GameTensor:
+    """
+    Two passes over the round documents: collect labels, then
+    write every record straight into preallocated arrays.
+    """
+
+    rounds = sorted(
+        (d for d in rounds if d.get("round_number") is not None),
+        key=lambda d: d["round_number"]
+    )
+
+    round_labels = sorted({int(d["round_number"]) for d in rounds})
+    market_labels = set()
+    company_labels = set()
+
+    for doc in rounds:
+        for rec in doc.get("market_data", []) or []:
+            company_labels.add(str(rec.get("company", rec.get("Company"))))
+            market_labels.add(int(rec.get("market_id", 1)))
+        for rec in doc.get("potential_demand", []) or []:
+            market_labels.add(int(rec["market_id"]))
+
+    tensor = GameTensor(
+        round_labels,
+        sorted(market_labels),
+        sorted(company_labels)
+    )
+
+    metric_items = list(tensor.metric_pos.items())
+
+    for doc in rounds:
+        r = tensor.round_pos[int(doc["round_number"])]
+
+        for rec in doc.get("market_data", []) or []:
+            rec = {_ALIASES.get(k, k): v for k, v in rec.items()}
+
+            m = tensor.market_pos[int(rec.get("market_id", 1))]
+            c = tensor.company_pos[str(rec["company"])]
+
+            row = tensor.values[r, m, c]
+            for key, k in metric_items:
+                value = rec.get(key)
+                if value is not None:
+                    row[k] = value
+
+            if "revenue" not in rec and "price" in rec and "sales_volume" in rec:
+                row[tensor.metric_pos["revenue"]] = rec["price"] * rec["sales_volume"]
+
+            tensor.mask[r, m, c] = True
+
+        # net profit is per company, repeated over its markets
+        profit_k = tensor.metric_pos["Net profit"]
+        for rec in doc.get("net_profit", []) or []:
+            company = str(rec.get("company", rec.get("Company")))
+            c = tensor.company_pos.get(company)
+            if c is None or rec.get("Net profit") is None:
+                continue
+            present = tensor.mask[r, :, c]
+            tensor.values[r, present, c, profit_k] = rec["Net profit"]
+
+        for rec in doc.get("potential_demand", []) or []:
+            m = tensor.market_pos[int(rec["market_id"])]
+            for k, key in enumerate(tensor.market_metrics):
+                if rec.get(key) is not None:
+                    tensor.market_values[r, m, k] = rec[key]
+
+        # production tables are cumulative; documents are processed
+        # in round order so the newest table wins
+        for rec in doc.get("production", []) or []:
+            pr = tensor.round_pos.get(rec.get("round_number"))
+            if pr is None:
+                continue
+            for k, key in enumerate(tensor.round_metrics):
+                if rec.get(key) is not None:
+                    tensor.round_values[pr, k] = rec[key]
+
+    return tensor
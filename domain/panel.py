@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+
+PANEL_INDEX = ["round", "market_id", "company"]
+
+
+def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # legacy documents carry "Company", "Product quality", ...
+    df.columns = [
+        c if c == "Net profit" else c.strip().lower().replace(" ", "_")
+        for c in df.columns
+    ]
+    # the injected round comes last and wins over a legacy "Round"
+    return df.loc[:, ~df.columns.duplicated(keep="last")]
+
+
+def _records_with_round(rounds, field: str) -> list:
+    records = []
+
+    for doc in rounds:
+        rnd = doc.get("round_number")
+
+        for rec in doc.get(field, []) or []:
+            rec = dict(rec)
+            if rnd is not None:
+                rec["round"] = rnd
+            records.append(rec)
+
+    return records
+
+
+def build_panel_frame(rounds) -> pd.DataFrame:
+    """
+    Canonical company x round x market frame from round documents.
+
+    - market_data and net_profit are joined on (company, round),
+      where round always comes from the document's round_number
+    - company is categorical, round / market_id are small ints
+    - indexed by (round, market_id, company), sorted, so
+      panel.loc[rnd] / panel.loc[(rnd, market)] are direct slices
+    """
+
+    rounds = list(rounds)
+
+    df_market = pd.DataFrame(_records_with_round(rounds, "market_data"))
+
+    if df_market.empty:
+        return pd.DataFrame(
+            index=pd.MultiIndex.from_arrays([[], [], []], names=PANEL_INDEX)
+        )
+
+    df_market = _normalize_columns(df_market)
+    df_market = df_market.drop(columns=["round_number"], errors="ignore")
+
+    df_profit = pd.DataFrame(_records_with_round(rounds, "net_profit"))
+
+    if not df_profit.empty:
+        df_profit = _normalize_columns(df_profit)
+        keep = [
+            c for c in df_profit.columns
+            if c in ("company", "round", "Net profit")
+        ]
+        df_profit = (
+            df_profit[keep]
+            .drop_duplicates(["company", "round"], keep="last")
+        )
+
+        df_market = df_market.drop(columns=["Net profit"], errors="ignore")
+        df_market = df_market.merge(
+            df_profit,
+            on=["company", "round"],
+            how="left"
+        )
+
+    if "market_id" not in df_market.columns:
+        df_market["market_id"] = 1
+
+    df_market["round"] = df_market["round"].astype(np.int16)
+    df_market["market_id"] = (
+        pd.to_numeric(df_market["market_id"]).astype(np.int8)
+    )
+    df_market["company"] = df_market["company"].astype(str).astype("category")
+
+    if {"price", "sales_volume"}.issubset(df_market.columns):
+        df_market["revenue"] = df_market["price"] * df_market["sales_volume"]
+
+    df_market = df_market.drop_duplicates(PANEL_INDEX, keep="last")
+
+    return df_market.set_index(PANEL_INDEX).sort_index()
+
+
+def upsert_panel_round(panel: pd.DataFrame, round_doc: dict) -> pd.DataFrame:
+    """
+    New panel with one round (re)placed from its document, for
+    carrying a cached panel forward after a save without
+    rebuilding it from every round.
+    """
+
+    new = build_panel_frame([round_doc])
+
+    if panel.empty:
+        return new
+
+    kept = panel.drop(
+        index=round_doc["round_number"], level="round", errors="ignore"
+    )
+
+    out = pd.concat([kept.reset_index(), new.reset_index()], ignore_index=True)
+
+    # the saved round may bring new companies
+    out["company"] = out["company"].astype(str).astype("category")
+    out["round"] = out["round"].astype(np.int16)
+    out["market_id"] = out["market_id"].astype(np.int8)
+
+    return out.set_index(PANEL_INDEX).sort_index()
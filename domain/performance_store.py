@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+
+MARKET_KEY = ["company", "round", "market_id"]
+PROFIT_KEY = ["company", "round"]
+PROFIT_COLUMN = "Net profit"
+
+
+class PerformanceStore:
+    """
+    Merged market + net profit rows kept in preallocated columns:
+
+        columns[name][row]                   float64, int64 or object array
+        index[(company, round, market_id)]   row position
+
+    Market rows and net profit are upserted by key; capacity doubles
+    when full. Net profit that arrives before its market rows is held
+    and filled in when they do. frame() wraps views of the first
+    n_rows of every column, nothing is concatenated or merged.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.n_rows = 0
+        self.columns = {}
+        self.index = {}
+        self.profit = {}
+        # (company, round) -> row positions, to spread net profit
+        self._profit_rows = {}
+
+        self._add_column("company", object)
+        self._add_column("round", np.int64)
+        self._add_column("market_id", np.int64)
+        self._add_column(PROFIT_COLUMN, float)
+
+    # ---------------------------
+    # STORAGE
+    # ---------------------------
+    @staticmethod
+    def _empty(capacity: int, dtype) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        if dtype == object:
+            return np.full(capacity, None, dtype=object)
+        if dtype.kind == "f":
+            return np.full(capacity, np.nan)
+        return np.zeros(capacity, dtype=dtype)
+
+    def _add_column(self, name, dtype):
+        self.columns[name] = self._empty(self.capacity, dtype)
+
+    def _grow(self, needed: int):
+        if needed <= self.capacity:
+            return
+
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+
+        for name, values in self.columns.items():
+            grown = self._empty(capacity, values.dtype)
+            grown[:self.n_rows] = values[:self.n_rows]
+            self.columns[name] = grown
+
+        self.capacity = capacity
+
+    # ---------------------------
+    # UPSERTS
+    # ---------------------------
+    def upsert_market(self, df: pd.DataFrame):
+        """
+        Insert or overwrite market rows keyed by (company, round, market_id).
+        """
+
+        if df.empty:
+            return
+
+        df = df.drop_duplicates(MARKET_KEY, keep="last")
+
+        companies = df["company"].astype(str).to_numpy()
+        rounds = df["round"].to_numpy(dtype=int)
+        markets = df["market_id"].to_numpy(dtype=int)
+
+        keys = list(zip(companies, rounds.tolist(), markets.tolist()))
+        positions = np.empty(len(keys), dtype=np.int64)
+
+        self._grow(self.n_rows + sum(key not in self.index for key in keys))
+
+        for i, key in enumerate(keys):
+            pos = self.index.get(key)
+            if pos is None:
+                pos = self.n_rows
+                self.n_rows += 1
+                self.index[key] = pos
+                self._profit_rows.setdefault(key[:2], []).append(pos)
+            positions[i] = pos
+
+        for name in df.columns:
+            if name in MARKET_KEY or name == PROFIT_COLUMN:
+                continue
+
+            values = df[name].to_numpy()
+            numeric = pd.api.types.is_numeric_dtype(values.dtype)
+
+            if name not in self.columns:
+                self._add_column(name, float if numeric else object)
+
+            column = self.columns[name]
+            column[positions] = (
+                values.astype(float) if column.dtype != object else values
+            )
+
+        self.columns["company"][positions] = companies
+        self.columns["round"][positions] = rounds
+        self.columns["market_id"][positions] = markets
+
+        # net profit pasted before these rows
+        profit = self.columns[PROFIT_COLUMN]
+        for pos, key in zip(positions, keys):
+            value = self.profit.get(key[:2])
+            if value is not None:
+                profit[pos] = value
+
+    def upsert_profit(self, df: pd.DataFrame):
+        """
+        Net profit keyed by (company, round), spread over that
+        company's market rows.
+        """
+
+        if df.empty:
+            return
+
+        df = df.drop_duplicates(PROFIT_KEY, keep="last")
+        column = self.columns[PROFIT_COLUMN]
+
+        for company, rnd, value in zip(
+            df["company"].astype(str),
+            df["round"].to_numpy(dtype=int).tolist(),
+            df[PROFIT_COLUMN].to_numpy(dtype=float),
+        ):
+            self.profit[(company, rnd)] = value
+            rows = self._profit_rows.get((company, rnd))
+            if rows:
+                column[rows] = value
+
+    def clear(self):
+        self.__init__(self.capacity)
+
+    # ---------------------------
+    # READ
+    # ---------------------------
+    def frame(self) -> pd.DataFrame:
+
+        n = self.n_rows
+
+        if n == 0:
+            return pd.DataFrame()
+
+        data = {
+            name: values[:n]
+            for name, values in self.columns.items()
+            # no net profit pasted yet: market columns only
+            if name != PROFIT_COLUMN or self.profit
+        }
+
+        return pd.DataFrame(data, copy=False)
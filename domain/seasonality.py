@@ -0,0 +1,24 @@
+import numpy as np
+
+
+SEASONS = ["spring", "summer", "autumn", "winter"]
+
+
+def season_for_round(round_number: int) -> str:
+    return SEASONS[(int(round_number) - 1) % 4]
+
+
+def seasonal_factors(round_numbers, seasonal_indicator: dict) -> np.ndarray:
+    """
+    Multiplier (indicator / 100) for every round in round_numbers.
+    Seasons missing from the indicator count as 100.
+    """
+
+    table = np.array(
+        [seasonal_indicator.get(s, 100) for s in SEASONS],
+        dtype=float
+    ) / 100
+
+    rounds = np.asarray(round_numbers, dtype=int)
+
+    return table[(rounds - 1) % 4]
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+
+def weighted_stats(
+    df: pd.DataFrame,
+    value_cols: list,
+    weight_col: str = "sales_volume",
+    by=None,
+    quantiles=(0.25, 0.5, 0.75)
+) -> pd.DataFrame:
+    """
+    Weighted mean / variance / SD / quantiles of many metrics over
+    many groups in one pass (grouped sums with np.add.reduceat).
+
+    Returns one row per (by..., metric) with total_weight, mean,
+    var, sd, q<pct> columns and a zero_weight flag. A missing value
+    only drops that row for that metric. Groups whose total weight
+    is 0 get NaN statistics and zero_weight=True instead of a
+    division by zero.
+    """
+
+    keys = list(by) if by else []
+    value_cols = [c for c in value_cols if c in df.columns]
+
+    columns = (
+        keys
+        + ["metric", "total_weight", "mean", "var", "sd"]
+        + [f"q{int(round(q * 100))}" for q in quantiles]
+        + ["zero_weight"]
+    )
+
+    if df.empty or not value_cols or weight_col not in df.columns:
+        return pd.DataFrame(columns=columns)
+
+    # ---------------------------
+    # group codes, rows sorted by group
+    # ---------------------------
+    if keys:
+        grouped = df.groupby(keys, sort=True, observed=True)
+        codes = grouped.ngroup().to_numpy()
+        groups = grouped.size().index.to_frame(index=False)
+    else:
+        codes = np.zeros(len(df), dtype=np.int64)
+        groups = pd.DataFrame(index=[0])
+
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+
+    values = df[value_cols].to_numpy(dtype=float)[order]
+    weights = df[weight_col].to_numpy(dtype=float)[order]
+    weights = np.where(np.isfinite(weights), np.clip(weights, 0, None), 0.0)
+
+    valid = np.isfinite(values)
+    w = np.where(valid, weights[:, None], 0.0)
+    x = np.where(valid, values, 0.0)
+
+    # ---------------------------
+    # moments
+    # ---------------------------
+    sw = np.add.reduceat(w, starts, axis=0)
+    swx = np.add.reduceat(w * x, starts, axis=0)
+
+    zero_weight = sw <= 0
+    safe_sw = np.where(zero_weight, 1.0, sw)
+
+    mean = np.where(zero_weight, np.nan, swx / safe_sw)
+
+    dev = np.where(valid, x - mean[codes], 0.0)
+    var = np.add.reduceat(w * dev ** 2, starts, axis=0) / safe_sw
+    var = np.where(zero_weight, np.nan, var)
+
+    out = {
+        "total_weight": sw,
+        "mean": mean,
+        "var": var,
+        "sd": np.sqrt(var),
+    }
+
+    # ---------------------------
+    # weighted quantiles: sort by (group, value), then search the
+    # global cumulative weight for each group's target
+    # ---------------------------
+    n_groups = len(starts)
+    group_end = np.r_[starts[1:], len(codes)] - 1
+
+    for q in quantiles:
+        out[f"q{int(round(q * 100))}"] = np.full((n_groups, len(value_cols)), np.nan)
+
+    for j in range(len(value_cols)):
+        idx = np.lexsort((np.where(valid[:, j], x[:, j], np.inf), codes))
+        xs = x[idx, j]
+        cw = np.cumsum(w[idx, j])
+        before = np.r_[0.0, cw][starts]
+
+        for q in quantiles:
+            pos = np.searchsorted(cw, before + q * sw[:, j], side="left")
+            pos = np.clip(pos, starts, group_end)
+            res = xs[pos]
+            res[zero_weight[:, j]] = np.nan
+            out[f"q{int(round(q * 100))}"][:, j] = res
+
+    # ---------------------------
+    # long form
+    # ---------------------------
+    n_metrics = len(value_cols)
+
+    result = groups.loc[groups.index.repeat(n_metrics)].reset_index(drop=True)
+    result = result[keys] if keys else pd.DataFrame(index=range(n_groups * n_metrics))
+    result["metric"] = np.tile(value_cols, n_groups)
+
+    for name, arr in out.items():
+        result[name] = np.asarray(arr).reshape(-1)
+
+    result["zero_weight"] = zero_weight.reshape(-1)
+
+    return result[columns]
@@ -0,0 +1,308 @@
+import numpy as np
+import pandas as pd
+
+
+OUTLIER_METRICS = ["price", "product_quality", "product_image", "sales_volume"]
+
+# robust z (median / MAD) above this is flagged
+ROBUST_Z_LIMIT = 3.5
+
+# a price this many times off the market median is a paste slip
+# (e.g. $730 instead of $7.30); volumes can legitimately be 0
+SCALE_SLIP_RATIO = 20.0
+SCALE_METRICS = ["price"]
+
+# market shares must sum to 100 +/- this many points, plus a small
+# allowance for whole-percent rounding of each company's share
+SHARE_SUM_TOLERANCE = 3.0
+SHARE_ROUNDING_PER_COMPANY = 0.05
+SHARE_SUM_WARNING = 1.0
+
+ISSUE_COLUMNS = ["level", "check", "market_id", "company", "value", "message"]
+
+
+class ValidationReport:
+
+    def __init__(self, issues: pd.DataFrame):
+        self.issues = issues
+
+    @property
+    def errors(self) -> pd.DataFrame:
+        return self.issues[self.issues["level"] == "error"]
+
+    @property
+    def warnings(self) -> pd.DataFrame:
+        return self.issues[self.issues["level"] == "warning"]
+
+    @property
+    def ok(self) -> bool:
+        return self.errors.empty
+
+
+class RoundValidationError(ValueError):
+
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        super().__init__(
+            f"Round failed validation: {len(report.errors)} error(s)"
+        )
+
+
+def _issues(df: pd.DataFrame, level, check, message, value_col=None):
+    """
+    Vectorized issue rows from a frame of offending rows.
+    """
+
+    if df.empty:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+
+    out = pd.DataFrame({
+        "level": level,
+        "check": check,
+        "market_id": df["market_id"] if "market_id" in df else None,
+        "company": df["company"].astype(str) if "company" in df else None,
+        "value": df[value_col] if value_col else np.nan,
+    })
+    out["message"] = message(df) if callable(message) else message
+
+    return out[ISSUE_COLUMNS]
+
+
+# =====================================================
+# CHECKS
+# =====================================================
+def check_share_sums(df_market: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shares per market should add up to ~100%: an error beyond
+    SHARE_SUM_TOLERANCE points (plus a small rounding allowance per
+    company), a warning beyond SHARE_SUM_WARNING.
+
+    >>> df = pd.DataFrame({
+    ...     "market_id": [1, 1, 2, 2, 3, 3],
+    ...     "market_share": [45, 45, 55, 55, 50, 50],
+    ... })
+    >>> check_share_sums(df)[["level", "market_id", "value"]].values.tolist()
+    [['error', 1, 90], ['error', 2, 110]]
+    """
+
+    sums = (
+        df_market
+        .groupby("market_id", as_index=False)
+        .agg(total=("market_share", "sum"), n=("market_share", "size"))
+    )
+
+    diff = (sums["total"] - 100).abs()
+    error_tol = SHARE_SUM_TOLERANCE + SHARE_ROUNDING_PER_COMPANY * sums["n"]
+
+    message = lambda d: "Market shares sum to " + d["total"].round(1).astype(str) + "%"
+
+    return pd.concat([
+        _issues(sums[diff > error_tol], "error", "share_sum", message, "total"),
+        _issues(
+            sums[(diff > SHARE_SUM_WARNING) & (diff <= error_tol)],
+            "warning", "share_sum", message, "total"
+        ),
+    ])
+
+
+def check_duplicates(df_market: pd.DataFrame, df_profit: pd.DataFrame) -> pd.DataFrame:
+
+    dup_market = df_market[
+        df_market.duplicated(["market_id", "company"], keep=False)
+    ].drop_duplicates(["market_id", "company"])
+
+    parts = [
+        _issues(
+            dup_market, "error", "duplicate_company",
+            "Company appears more than once in this market"
+        )
+    ]
+
+    if not df_profit.empty and "company" in df_profit:
+        dup_profit = df_profit[
+            df_profit.duplicated("company", keep=False)
+        ].drop_duplicates("company")
+        parts.append(_issues(
+            dup_profit, "error", "duplicate_company",
+            "Company appears more than once in net profit"
+        ))
+
+        unknown = df_profit[~df_profit["company"].isin(df_market["company"])]
+        parts.append(_issues(
+            unknown, "warning", "unknown_company",
+            "Net profit for a company with no market data"
+        ))
+
+    return pd.concat(parts)
+
+
+def check_outliers(df_market: pd.DataFrame, history: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Robust z-score (median / 1.4826 MAD) of every metric against the
+    same market's history; the round itself is the reference when
+    there is no history yet. Non-zero SCALE_METRICS values
+    SCALE_SLIP_RATIO x off the median are errors; everything else,
+    zero volumes included, can only raise an outlier warning.
+    """
+
+    metrics = [m for m in OUTLIER_METRICS if m in df_market.columns]
+
+    reference = history if history is not None and not history.empty else df_market
+    metrics = [m for m in metrics if m in reference.columns]
+
+    if not metrics:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+
+    ref_long = reference[["market_id"] + metrics].melt(
+        id_vars="market_id", var_name="metric", value_name="value"
+    ).dropna()
+
+    ref_long["market_id"] = ref_long["market_id"].astype(int)
+
+    stats = ref_long.groupby(["market_id", "metric"])["value"].agg(
+        median="median",
+        mad=lambda v: (v - v.median()).abs().median()
+    ).reset_index()
+
+    cur = df_market[["market_id", "company"] + metrics].melt(
+        id_vars=["market_id", "company"], var_name="metric", value_name="value"
+    ).dropna()
+    cur["market_id"] = cur["market_id"].astype(int)
+
+    cur = cur.merge(stats, on=["market_id", "metric"], how="inner")
+
+    scale = 1.4826 * cur["mad"].to_numpy(float)
+    dev = (cur["value"] - cur["median"]).to_numpy(float)
+
+    value = cur["value"].to_numpy(float)
+    median = cur["median"].to_numpy(float)
+    checkable = (
+        cur["metric"].isin(SCALE_METRICS).to_numpy()
+        & (value != 0)
+        & (median != 0)
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(scale > 0, dev / scale, 0.0)
+        ratio = np.where(checkable, np.abs(value / median), 1.0)
+
+    slip = checkable & (
+        (ratio >= SCALE_SLIP_RATIO) | (ratio <= 1 / SCALE_SLIP_RATIO)
+    )
+    outlier = (np.abs(z) > ROBUST_Z_LIMIT) & ~slip
+
+    cur["z"] = z
+
+    return pd.concat([
+        _issues(
+            cur[slip], "error", "scale_slip",
+            lambda d: d["metric"] + " is " + (d["value"] / d["median"]).round(1).astype(str)
+            + "x the market median",
+            "value"
+        ),
+        _issues(
+            cur[outlier], "warning", "outlier",
+            lambda d: d["metric"] + " robust z = " + d["z"].round(1).astype(str),
+            "value"
+        ),
+    ])
+
+
+def check_production(
+    df_production: pd.DataFrame,
+    df_potential_demand: pd.DataFrame,
+    round_number: int
+) -> pd.DataFrame:
+    """
+    FG per market must add up to the FG total, and this round's FG
+    per market must match the demand table's ending inventory.
+    """
+
+    if df_production.empty:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+
+    fg_cols = sorted(c for c in df_production.columns if c.startswith("fg_inventory_"))
+    parts = []
+
+    if fg_cols and "finished_goods_inventory_total" in df_production:
+        fg_sum = df_production[fg_cols].sum(axis=1)
+        bad = df_production.assign(fg_sum=fg_sum)[
+            fg_sum != df_production["finished_goods_inventory_total"]
+        ]
+        parts.append(_issues(
+            bad, "error", "fg_total",
+            lambda d: "Round " + d["round_number"].astype(str)
+            + ": FG per market sums to " + d["fg_sum"].astype(str)
+            + ", total says " + d["finished_goods_inventory_total"].astype(str),
+            "fg_sum"
+        ))
+
+    current = df_production[df_production["round_number"] == round_number]
+
+    if fg_cols and not current.empty and not df_potential_demand.empty:
+        fg = current.iloc[-1][fg_cols]
+        df_fg = pd.DataFrame({
+            "market_id": [int(c.rsplit("_", 1)[-1]) for c in fg_cols],
+            "production_fg": fg.to_numpy(dtype=float),
+        })
+
+        demand = df_potential_demand.assign(
+            market_id=df_potential_demand["market_id"].astype(int)
+        )[["market_id", "finished_goods_inventory"]]
+
+        merged = df_fg.merge(demand, on="market_id", how="inner")
+        bad = merged[merged["production_fg"] != merged["finished_goods_inventory"]]
+
+        parts.append(_issues(
+            bad, "error", "fg_market",
+            lambda d: "Production FG " + d["production_fg"].astype(int).astype(str)
+            + " vs demand table " + d["finished_goods_inventory"].astype(str),
+            "production_fg"
+        ))
+
+    if not parts:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+
+    return pd.concat(parts)
+
+
+# =====================================================
+# PIPELINE
+# =====================================================
+def validate_round(
+    df_market: pd.DataFrame,
+    df_profit: pd.DataFrame = None,
+    df_production: pd.DataFrame = None,
+    df_potential_demand: pd.DataFrame = None,
+    round_number: int = None,
+    history: pd.DataFrame = None
+) -> ValidationReport:
+    """
+    Every check over the parsed frames, no I/O. `history` is the
+    game's panel frame for earlier rounds (optional).
+    """
+
+    df_profit = df_profit if df_profit is not None else pd.DataFrame()
+    df_production = df_production if df_production is not None else pd.DataFrame()
+    df_potential_demand = (
+        df_potential_demand if df_potential_demand is not None else pd.DataFrame()
+    )
+
+    if history is not None and not history.empty and round_number is not None:
+        history = history[history["round"] != round_number]
+
+    parts = [
+        check_share_sums(df_market),
+        check_duplicates(df_market, df_profit),
+        check_outliers(df_market, history),
+        check_production(df_production, df_potential_demand, round_number),
+    ]
+
+    parts = [p for p in parts if not p.empty]
+
+    issues = (
+        pd.concat(parts, ignore_index=True)
+        if parts else pd.DataFrame(columns=ISSUE_COLUMNS)
+    )
+
+    return ValidationReport(issues)
@@ -0,0 +1,43 @@
+import argparse
+import os
+
+from infrastructure.firebase_client import init_firebase
+from infrastructure.firestore_repository import FirestoreRepository
+from application.export_service import EXPORT_FORMATS, EXPORT_TABLES, ExportService
+
+
+# =====================================================
+# CLI
+# =====================================================
+# python export_games.py --format parquet --out exports
+# python export_games.py --game game_2024 --format xlsx --table panel
+parser = argparse.ArgumentParser(
+    description="Export game tables to Parquet / CSV / Excel"
+)
+parser.add_argument("--game", action="append", default=[], help="default: every game")
+parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="parquet")
+parser.add_argument("--table", action="append", choices=EXPORT_TABLES, default=[])
+parser.add_argument("--out", default="exports")
+parser.add_argument("--chunk-rows", type=int, default=5000)
+
+args = parser.parse_args()
+
+repo = FirestoreRepository(init_firebase())
+service = ExportService(repo, chunk_rows=args.chunk_rows)
+
+os.makedirs(args.out, exist_ok=True)
+
+for game_id in args.game or repo.list_games():
+
+    path = os.path.join(args.out, service.file_name(game_id, args.format))
+
+    # written to disk one table at a time; each table is built in
+    # full, then encoded in --chunk-rows chunks
+    written = service.export(
+        game_id,
+        args.format,
+        path,
+        tables=args.table or None
+    )
+
+    print(f"{game_id}: {written} -> {path}")
@@ -8,7 +8,11 @@ def init_firebase():
     if firebase_admin._apps:
         return firestore.client()
 
-    local_key_path = "mbs-calculator-firebase-adminsdk-fbsvc-86153c9e06.json"
+    # FIREBASE_KEY_PATH lets headless jobs run without Streamlit secrets
+    local_key_path = os.environ.get(
+        "FIREBASE_KEY_PATH",
+        "mbs-calculator-firebase-adminsdk-fbsvc-86153c9e06.json"
+    )
 
     if os.path.exists(local_key_path):
         cred = credentials.Certificate(local_key_path)
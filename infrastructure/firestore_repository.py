@@ -1,5 +1,42 @@
 from datetime import datetime
 import pandas as pd
+from firebase_admin import firestore
+
+from domain.panel import build_panel_frame
+
+
+PRODUCTION_TIMELINE_FIELDS = [
+    "sales_volume",
+    "production_volume",
+    "next_production_capacity",
+    "raw_material_inventory",
+    "finished_goods_inventory_total",
+]
+
+
+def production_timeline_entry(record: dict) -> dict:
+    """
+    Compact production/inventory record stored on the game document.
+    Accepts both the flat parser schema (fg_inventory_1..4)
+    and the legacy nested one (fg_inventory: {"1": ...}).
+    """
+
+    entry = {
+        field: record.get(field, 0)
+        for field in PRODUCTION_TIMELINE_FIELDS
+    }
+
+    fg_inventory = dict(record.get("fg_inventory", {}) or {})
+
+    for key, value in record.items():
+        if key.startswith("fg_inventory_"):
+            fg_inventory[key.rsplit("_", 1)[-1]] = value
+
+    entry["fg_inventory"] = {
+        str(k): v for k, v in fg_inventory.items()
+    }
+
+    return entry
 
 
 class FirestoreRepository:
@@ -37,6 +74,36 @@ class FirestoreRepository:
         games = self.db.collection("mbs_games").stream()
         return [g.id for g in games]
 
+    def count_games(self) -> int:
+        # aggregation query: billed per 1000 games, no documents read
+        result = self.db.collection("mbs_games").count().get()
+        return int(result[0][0].value)
+
+    def list_games_page(self, page_size: int = 200, start_after=None, fields=None):
+        """
+        One page of games in document id order, reading only
+        `fields`. Returns (entries, cursor); pass cursor back as
+        start_after for the next page, None once exhausted.
+
+        The id never changes, so a game updated while paging can
+        neither be skipped nor read twice; callers sort by updated_at.
+        """
+
+        query = self.db.collection("mbs_games").order_by("__name__")
+
+        if fields:
+            query = query.select(list(fields))
+
+        if start_after is not None:
+            query = query.start_after(start_after)
+
+        docs = list(query.limit(page_size).stream())
+
+        entries = [{"game_id": d.id, **(d.to_dict() or {})} for d in docs]
+        cursor = docs[-1] if len(docs) == page_size else None
+
+        return entries, cursor
+
     # ---------------------------
     # ROUND
     # ---------------------------
@@ -61,25 +128,66 @@ class FirestoreRepository:
             if not isinstance(df, pd.DataFrame):
                 raise TypeError(f"{name} must be a pandas DataFrame")
 
+        game_ref = self.db.collection("mbs_games").document(game_id)
         round_ref = (
-            self.db.collection("mbs_games")
-            .document(game_id)
+            game_ref
             .collection("rounds")
             .document(f"round_{round_number}")
         )
 
-        round_ref.set({
+        now = datetime.utcnow()
+
+        round_payload = {
             "round_number": round_number,
             "market_data": market_df.to_dict("records"),
             "net_profit": profit_df.to_dict("records"),
             "production": production_df.to_dict("records"),
             "potential_demand": potential_demand_df.to_dict("records"),
-            "updated_at": datetime.utcnow()
-        })
+            "updated_at": now
+        }
+
+        # production table is cumulative (one row per past round),
+        # so every save refreshes those rounds on the timeline
+        timeline_update = {
+            str(int(r["round_number"])): production_timeline_entry(r)
+            for r in round_payload["production"]
+            if r.get("round_number") is not None
+        }
+
+        @firestore.transactional
+        def _write(transaction):
+
+            snapshot = game_ref.get(transaction=transaction)
+            game = snapshot.to_dict() if snapshot.exists else {}
+
+            latest_round = max(
+                int(game.get("latest_round") or 0),
+                int(round_number)
+            )
+
+            timeline = dict(game.get("production_timeline", {}))
+            timeline.update(timeline_update)
+
+            data_version = int(game.get("data_version") or 0) + 1
+
+            transaction.set(round_ref, round_payload)
+            transaction.set(
+                game_ref,
+                {
+                    "data_version": data_version,
+                    "latest_round": latest_round,
+                    "production_timeline": timeline,
+                    "updated_at": now
+                },
+                merge=True
+            )
+
+            return data_version
+
+        data_version = _write(self.db.transaction())
+
+        return round_payload, data_version
 
-        self.db.collection("mbs_games").document(game_id).update({
-            "updated_at": datetime.utcnow()
-        })
     # ---------------------------
     # LOAD ROUND (structured)
     # ---------------------------
@@ -138,34 +246,10 @@ class FirestoreRepository:
 
     def load_all_rounds(self, game_id):
 
-        rounds_ref = (
-            self.db.collection("mbs_games")
-            .document(game_id)
-            .collection("rounds")
-            .stream()
-        )
-
-        all_market = []
-        all_profit = []
-
-        for doc in rounds_ref:
-            data = doc.to_dict()
-            all_market.extend(data.get("market_data", []))
-            all_profit.extend(data.get("net_profit", []))
-
-        df_market = pd.DataFrame(all_market)
-        df_profit = pd.DataFrame(all_profit)
-
-        if df_profit.empty:
-            return df_market
+        # merged on (company, round) with the round taken from
+        # each document's round_number
+        return build_panel_frame(self.get_all_rounds(game_id)).reset_index()
 
-        return pd.merge(
-            df_market,
-            df_profit,
-            on=["company", "round_number"],
-            how="left"
-        )
-    
     def get_round_numbers(self, game_id: str):
 
         rounds_ref = (
@@ -196,6 +280,23 @@ class FirestoreRepository:
         return [doc.to_dict() for doc in rounds_ref]
 
     
+    def get_production_timeline(self, game_id: str) -> dict:
+        """
+        Denormalized timeline kept on the game document
+        by save_round. Keys are round numbers as strings.
+        """
+        return self.get_game(game_id).get("production_timeline", {})
+
+    def get_data_version(self, game_id: str) -> int:
+        """
+        Bumped on every save; used as the cache key for
+        everything derived from a game's rounds.
+        """
+        return int(self.get_game(game_id).get("data_version") or 0)
+
+    def get_latest_round(self, game_id: str):
+        return self.get_game(game_id).get("latest_round")
+
     def get_seasonal_indicator(self, game_id: str) -> dict:
         game = self.get_game(game_id)
         return game.get("seasonal_indicator", {})
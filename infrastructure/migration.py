@@ -0,0 +1,288 @@
+import copy
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Firestore rejects batches above 500 writes
+MAX_BATCH_SIZE = 500
+
+
+# =====================================================
+# TRANSFORMS (applied to one record of a round array)
+# =====================================================
+class RenameField:
+
+    def __init__(self, old: str, new: str):
+        self.old = old
+        self.new = new
+
+    def apply(self, record: dict) -> bool:
+        if self.old not in record:
+            return False
+        record[self.new] = record.pop(self.old)
+        return True
+
+
+class DropField:
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def apply(self, record: dict) -> bool:
+        if self.name not in record:
+            return False
+        del record[self.name]
+        return True
+
+
+class ComputeField:
+    """
+    Recompute a derived field, e.g.
+    ComputeField("revenue", lambda r: r["price"] * r["sales_volume"])
+    """
+
+    def __init__(self, name: str, func, requires=()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+
+    def apply(self, record: dict) -> bool:
+        if any(k not in record for k in self.requires):
+            return False
+
+        value = self.func(record)
+
+        if record.get(self.name) == value:
+            return False
+
+        record[self.name] = value
+        return True
+
+
+class ChangeLayout:
+    """
+    Arbitrary record reshape. func returns the new record.
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def apply(self, record: dict) -> bool:
+        new_record = self.func(dict(record))
+
+        if new_record == record:
+            return False
+
+        record.clear()
+        record.update(new_record)
+        return True
+
+
+class Migration:
+    """
+    Declarative migration: a list of transforms
+    run over every record of one round array
+    (market_data, net_profit, production, potential_demand).
+    """
+
+    def __init__(self, name: str, array_field: str, transforms: list):
+        self.name = name
+        self.array_field = array_field
+        self.transforms = transforms
+
+    def migrate_round(self, data: dict):
+        """
+        Returns the new array, or None when nothing changed.
+        """
+
+        records = data.get(self.array_field, [])
+
+        if not records:
+            return None
+
+        new_records = copy.deepcopy(records)
+        updated = False
+
+        for record in new_records:
+            for transform in self.transforms:
+                if transform.apply(record):
+                    updated = True
+
+        return new_records if updated else None
+
+
+# =====================================================
+# RUNNER
+# =====================================================
+class MigrationRunner:
+    """
+    Pages through mbs_games, migrates each game's rounds
+    in a worker pool and commits writes in batches.
+
+    Finished games are appended to a checkpoint file so a
+    rerun resumes where the previous one stopped. A run that
+    completes deletes it, so a later migration with the same name
+    starts from scratch.
+    """
+
+    def __init__(
+        self,
+        db,
+        migration: Migration,
+        workers: int = 4,
+        batch_size: int = 400,
+        page_size: int = 50,
+        checkpoint_path: str = None,
+        dry_run: bool = False,
+        log=print
+    ):
+        self.db = db
+        self.migration = migration
+        self.workers = workers
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.page_size = page_size
+        self.checkpoint_path = (
+            checkpoint_path or f".migration_{migration.name}.checkpoint"
+        )
+        self.dry_run = dry_run
+        self.log = log
+
+        self._lock = threading.Lock()
+        self._done = self._load_checkpoint()
+
+    # ---------------------------
+    # CHECKPOINT
+    # ---------------------------
+    def _load_checkpoint(self) -> set:
+        if not os.path.exists(self.checkpoint_path):
+            return set()
+
+        with open(self.checkpoint_path) as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def _clear_checkpoint(self):
+        with self._lock:
+            self._done.clear()
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+
+    def _mark_done(self, game_id: str):
+        # dry runs must not make the real run skip games
+        if self.dry_run:
+            return
+
+        with self._lock:
+            self._done.add(game_id)
+            with open(self.checkpoint_path, "a") as f:
+                f.write(game_id + "\n")
+
+    # ---------------------------
+    # PAGING
+    # ---------------------------
+    def iter_game_pages(self):
+        games_ref = self.db.collection("mbs_games")
+        last = None
+
+        while True:
+            query = (
+                games_ref
+                # "__name__" is FieldPath.document_id(), which
+                # firebase_admin.firestore does not re-export
+                .order_by("__name__")
+                .limit(self.page_size)
+            )
+
+            if last is not None:
+                query = query.start_after(last)
+
+            page = list(query.stream())
+
+            if not page:
+                return
+
+            yield [g for g in page if g.id not in self._done]
+
+            last = page[-1]
+
+    # ---------------------------
+    # ONE GAME
+    # ---------------------------
+    def migrate_game(self, game_doc) -> dict:
+
+        stats = {"game_id": game_doc.id, "rounds": 0, "bytes": 0}
+        field = self.migration.array_field
+
+        batch = self.db.batch()
+        pending = 0
+
+        for round_doc in game_doc.reference.collection("rounds").stream():
+            new_records = self.migration.migrate_round(round_doc.to_dict())
+
+            if new_records is None:
+                continue
+
+            stats["rounds"] += 1
+            stats["bytes"] += len(json.dumps(new_records, default=str))
+
+            if self.dry_run:
+                continue
+
+            batch.update(round_doc.reference, {field: new_records})
+            pending += 1
+
+            if pending >= self.batch_size:
+                batch.commit()
+                batch = self.db.batch()
+                pending = 0
+
+        if pending:
+            batch.commit()
+
+        self._mark_done(game_doc.id)
+
+        return stats
+
+    # ---------------------------
+    # RUN
+    # ---------------------------
+    def run(self) -> dict:
+
+        report = {
+            "migration": self.migration.name,
+            "dry_run": self.dry_run,
+            "games_scanned": 0,
+            "games_touched": 0,
+            "rounds_touched": 0,
+            "bytes_touched": 0,
+            "skipped_from_checkpoint": len(self._done),
+        }
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for page in self.iter_game_pages():
+                for stats in pool.map(self.migrate_game, page):
+                    report["games_scanned"] += 1
+
+                    if stats["rounds"]:
+                        report["games_touched"] += 1
+                        report["rounds_touched"] += stats["rounds"]
+                        report["bytes_touched"] += stats["bytes"]
+
+                        verb = "Would update" if self.dry_run else "Updated"
+                        self.log(
+                            f"{verb} {stats['game_id']}: "
+                            f"{stats['rounds']} rounds, {stats['bytes']:,} bytes"
+                        )
+
+                self.log(
+                    f"Progress: {report['games_scanned']} games scanned, "
+                    f"{report['rounds_touched']} rounds touched"
+                )
+
+        # every game is done; a failure above raises and keeps the
+        # checkpoint for the rerun
+        if not self.dry_run:
+            self._clear_checkpoint()
+
+        return report
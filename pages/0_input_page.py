@@ -6,19 +6,43 @@ from io import StringIO
 from infrastructure.firebase_client import init_firebase
 from infrastructure.firestore_repository import FirestoreRepository
 from application.round_service import RoundService
+from application.competitor_service import CompetitorService
+from application.game_catalog_service import GameCatalogService
+from application.post_save_worker import PostSaveWorker
+from application.panel_builder import PanelBuilder
+from ui.export_sidebar import render_export_sidebar
+from domain.panel import build_panel_frame
+from domain.validation import RoundValidationError
 
 
 # =====================================================
 # INIT SERVICES
 # =====================================================
+@st.cache_resource
+def get_post_save_worker():
+    db = init_firebase()
+    repo = FirestoreRepository(db)
+    return PostSaveWorker(repo)
+
+
 @st.cache_resource
 def get_round_service():
     db = init_firebase()
     repo = FirestoreRepository(db)
-    return RoundService(repo)
+    service = RoundService(repo)
+    # carry the cached panel forward before anything reads it
+    service.subscribe(PanelBuilder(repo).on_round_saved)
+    # keep the shared per-company series warm after each save
+    service.subscribe(CompetitorService(repo).on_round_saved)
+    # bump the game to the top of the home page list
+    service.subscribe(GameCatalogService(repo).on_round_saved)
+    # warm the pages' caches for the new version off-thread
+    service.subscribe(get_post_save_worker().on_round_saved)
+    return service
 
 
 round_service = get_round_service()
+post_save_worker = get_post_save_worker()
 
 
 # =====================================================
@@ -30,6 +54,12 @@ if "game_id" not in st.session_state:
 
     
 game_id = st.session_state["game_id"]
+
+
+# =====================================================
+# EXPORT
+# =====================================================
+render_export_sidebar(game_id)
 round_numbers = round_service.get_round_numbers(game_id)
 
 # ถ้า game_id เปลี่ยน → reset
@@ -91,6 +121,53 @@ st.text_area("Paste Production/Inventory", key="input_production", height=150)
 st.header("potential demand")
 st.text_area("Paste Potential Demand", key="input_potential_demand",height=150)
 
+# =====================================================
+# VALIDATION
+# =====================================================
+def get_history():
+    # rounds already in the session; validation makes no reads
+    rounds_data = st.session_state.get("rounds_data") or {}
+    if not rounds_data:
+        return None
+    return build_panel_frame(list(rounds_data.values())).reset_index()
+
+
+def collect_inputs():
+    return dict(
+        round_number=round_number,
+        market_blocks=split_markets(
+            st.session_state.get("input_all_markets", "").strip()
+        ),
+        net_profit_text=st.session_state.get("input_net_profit", "").strip(),
+        production_text=st.session_state.get("input_production", "").strip(),
+        potential_demand_text=st.session_state.get("input_potential_demand", "").strip(),
+    )
+
+
+def render_report(report):
+    if report.issues.empty:
+        st.success("All checks passed.")
+        return
+
+    n_errors, n_warnings = len(report.errors), len(report.warnings)
+    if n_errors:
+        st.error(f"{n_errors} error(s), {n_warnings} warning(s)")
+    else:
+        st.warning(f"{n_warnings} warning(s)")
+
+    st.dataframe(report.issues, width="stretch", hide_index=True)
+
+
+def validate_inputs():
+    try:
+        st.session_state["validation_report"] = round_service.check_round(
+            **collect_inputs(), history=get_history()
+        )
+    except Exception as e:
+        st.session_state.pop("validation_report", None)
+        st.error(str(e))
+
+
 # =====================================================
 # SAVE LOGIC (CLEAN)
 # =====================================================
@@ -103,37 +180,55 @@ def save_round():
     if st.session_state.get("input_potential_demand") == "":
         st.error("potential demand is empty")
 
-    raw_text = st.session_state.get("input_all_markets", "").strip()
-    market_blocks = split_markets(raw_text)
-
-    net_profit_text = st.session_state.get("input_net_profit", "").strip()
-    production_text = st.session_state.get("input_production","").strip()
-    potential_demand_text = st.session_state.get("input_potential_demand","").strip()
-    
-
     try:
-        round_service.save_round(
+        round_doc = round_service.save_round(
             game_id=game_id,
-            round_number=round_number,
-            market_blocks=market_blocks,
-            net_profit_text=net_profit_text,
-            production_text=production_text,
-            potential_demand_text=potential_demand_text
+            **collect_inputs(),
+            history=get_history(),
+            ignore_errors=st.session_state.get("ignore_validation", False)
         )
-        raw_rounds = round_service.get_all_rounds(game_id)
+        st.session_state.pop("validation_report", None)
+
+        # add just the saved round; pages load the rest on demand
+        # when the session has not loaded this game yet
+        if st.session_state.get("rounds_data"):
+            st.session_state["rounds_data"] = round_service.upsert_round(
+                st.session_state["rounds_data"],
+                round_doc
+            )
 
-        st.session_state["rounds_data"] = {
-            r["round_number"]: r
-            for r in raw_rounds
-        }
-        
         st.success(f"Round {round_number} saved successfully.")
 
         st.session_state["input_round_number"] = round_number + 1
         st.rerun()
 
+    except RoundValidationError as e:
+        st.session_state["validation_report"] = e.report
+        st.error(str(e))
+
     except Exception as e:
         st.error(str(e))
 
 
-st.button("Save Round", on_click=save_round)
\ No newline at end of file
+st.checkbox("Save even if validation fails", key="ignore_validation")
+
+col_check, col_save = st.columns(2)
+col_check.button("Validate", on_click=validate_inputs)
+col_save.button("Save Round", on_click=save_round)
+
+if "validation_report" in st.session_state:
+    render_report(st.session_state["validation_report"])
+
+
+# =====================================================
+# BACKGROUND JOBS
+# =====================================================
+jobs = post_save_worker.status(game_id)
+
+if not jobs.empty:
+    with st.expander("⚙️ Background jobs", expanded=(jobs["state"].isin(["queued", "running"])).any()):
+        st.dataframe(
+            jobs[["round_number", "data_version", "state", "seconds", "error"]],
+            width="stretch",
+            hide_index=True
+        )
@@ -1,9 +1,15 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import altair as alt
 
 from infrastructure.firebase_client import init_firebase
 from infrastructure.firestore_repository import FirestoreRepository
 from application.round_service import RoundService
+from application.inventory_planning_service import InventoryPlanningService
+from application.production_optimizer_service import ProductionOptimizerService
+from application.potential_demand_service import DemandService
+from ui.export_sidebar import render_export_sidebar
 
 
 
@@ -35,6 +41,30 @@ def get_service():
 
 round_service = get_service()
 
+@st.cache_resource
+def get_planning_service():
+    db = init_firebase()
+    repo = FirestoreRepository(db)
+    return InventoryPlanningService(repo)
+
+planning_service = get_planning_service()
+
+@st.cache_resource
+def get_optimizer_service():
+    db = init_firebase()
+    repo = FirestoreRepository(db)
+    return ProductionOptimizerService(repo)
+
+optimizer_service = get_optimizer_service()
+
+@st.cache_resource
+def get_demand_service():
+    db = init_firebase()
+    repo = FirestoreRepository(db)
+    return DemandService(repo)
+
+demand_service = get_demand_service()
+
 # =====================================================
 # REQUIRE GAME
 # =====================================================
@@ -45,6 +75,12 @@ if "game_id" not in st.session_state:
 game_id = st.session_state["game_id"]
 
 
+# =====================================================
+# EXPORT
+# =====================================================
+render_export_sidebar(game_id)
+
+
 # =====================================================
 # HANDLE GAME SWITCH
 # =====================================================
@@ -211,4 +247,193 @@ if not df_demand.empty:
     )
 
 else:
-    st.info("No demand data available.")
\ No newline at end of file
+    st.info("No demand data available.")
+
+# dense round x market x company arrays, built once per game version
+tensor = demand_service.panels.get_tensor(game_id)
+
+# every round x market at once, one array expression
+df_lost = demand_service.lost_sales_matrix(tensor)
+
+if not df_lost.empty:
+
+    with st.expander("Lost sales by round"):
+
+        df_lost = df_lost.add_prefix("Market ")
+
+        st.dataframe(
+            df_lost.style.format("{:.1%}"),
+            width="stretch"
+        )
+
+st.divider()
+
+# =====================================================
+# PRODUCTION SENSITIVITY
+# =====================================================
+st.subheader("🔥 Production Sensitivity")
+
+snapshot = planning_service.get_tensor_snapshot(tensor)
+
+if snapshot and not df_demand.empty:
+
+    base_demand = float(df_demand["Potential Demand"].sum())
+
+    c1, c2 = st.columns(2)
+    demand_range = c1.slider(
+        "Demand range (% of latest potential demand)",
+        min_value=50,
+        max_value=150,
+        value=(70, 130),
+        step=5
+    )
+    max_ratio = c2.slider(
+        "Max safety-stock ratio",
+        min_value=0.05,
+        max_value=1.0,
+        value=0.5,
+        step=0.05
+    )
+
+    demands = base_demand * np.arange(
+        demand_range[0], demand_range[1] + 1, 5
+    ) / 100
+    ratios = np.round(np.linspace(0, max_ratio, 11), 3)
+
+    # whole grid in one vectorized evaluation
+    df_grid = planning_service.compute_production_plan_grid(
+        snapshot,
+        forecast_demand=demands,
+        target_ratio=ratios
+    )
+
+    heatmap = alt.Chart(df_grid).mark_rect().encode(
+        x=alt.X("forecast_demand:O", title="Forecast demand",
+                axis=alt.Axis(format=",.0f")),
+        y=alt.Y("target_ratio:O", title="Target ratio", sort="descending"),
+        color=alt.Color(
+            "utilization_pct:Q",
+            title="Utilization %",
+            scale=alt.Scale(scheme="redyellowgreen", reverse=True)
+        ),
+        tooltip=[
+            alt.Tooltip("forecast_demand:Q", format=",.0f"),
+            "target_ratio:Q",
+            alt.Tooltip("required_production:Q", format=",.0f"),
+            alt.Tooltip("utilization_pct:Q", format=".1f"),
+            alt.Tooltip("capacity_gap:Q", format=",.0f"),
+            "risk:N",
+        ]
+    )
+
+    st.altair_chart(heatmap, width="stretch")
+
+else:
+    st.info("Need production and demand data for the sensitivity grid.")
+
+st.divider()
+
+# =====================================================
+# DEMAND FORECAST
+# =====================================================
+st.subheader("🔮 Demand Forecast")
+
+horizon = st.slider("Rounds ahead", min_value=2, max_value=12, value=8)
+
+# fitted models are cached per game version, all markets in one call
+df_forecast = optimizer_service.forecaster.forecast(
+    game_id,
+    horizon=horizon
+)
+
+if not df_forecast.empty:
+
+    band = alt.Chart(df_forecast).mark_area(opacity=0.2).encode(
+        x=alt.X("round:O", title="Round"),
+        y=alt.Y("lower:Q", title="Potential demand"),
+        y2="upper:Q",
+        color=alt.Color("market_id:N", title="Market")
+    )
+
+    line = alt.Chart(df_forecast).mark_line(point=True).encode(
+        x="round:O",
+        y="forecast:Q",
+        color="market_id:N",
+        tooltip=[
+            "round", "market_id",
+            alt.Tooltip("forecast:Q", format=",.0f"),
+            alt.Tooltip("lower:Q", format=",.0f"),
+            alt.Tooltip("upper:Q", format=",.0f"),
+        ]
+    )
+
+    st.altair_chart(band + line, width="stretch")
+
+else:
+    st.info("No potential demand history to forecast from.")
+
+st.divider()
+
+# =====================================================
+# MULTI-ROUND PRODUCTION PLAN
+# =====================================================
+st.subheader("🧮 Multi-Round Production Plan")
+
+c1, c2, c3 = st.columns(3)
+rm_per_unit = c1.number_input(
+    "RM / unit produced",
+    value=0.0,
+    min_value=0.0,
+    help="Caps cumulative production by the latest raw material inventory; 0 = no RM limit"
+)
+holding_cost = c2.number_input("Holding cost / unit", value=1.0, min_value=0.0)
+stockout_cost = c3.number_input("Stock-out cost / unit", value=5.0, min_value=0.0)
+
+result = optimizer_service.optimize_for_game(
+    game_id,
+    horizon=horizon,
+    holding_cost=holding_cost,
+    stockout_cost=stockout_cost,
+    rm_per_unit=rm_per_unit
+)
+
+if result and result["status"] == "optimal":
+
+    df_plan_rounds = result["rounds"].rename(columns={
+        "round": "Round",
+        "production": "Production",
+        "capacity": "Capacity",
+        "utilization_pct": "Utilization (%)",
+        "demand": "Forecast Demand",
+        "lost_sales": "Lost Sales",
+        "ending_fg_inventory": "Ending FG Inventory",
+    })
+
+    st.dataframe(
+        df_plan_rounds.style.format({
+            "Production": "{:,.0f}",
+            "Capacity": "{:,.0f}",
+            "Utilization (%)": "{:.1f}%",
+            "Forecast Demand": "{:,.0f}",
+            "Lost Sales": "{:,.0f}",
+            "Ending FG Inventory": "{:,.0f}",
+        }),
+        width="stretch",
+        hide_index=True
+    )
+
+    allocation_chart = alt.Chart(result["plan"]).mark_bar().encode(
+        x=alt.X("round:O", title="Round"),
+        y=alt.Y("allocation:Q", title="Production allocated"),
+        color=alt.Color("market_id:N", title="Market"),
+        tooltip=["round", "market_id", "demand", "allocation",
+                 "lost_sales", "ending_fg_inventory"]
+    )
+
+    st.altair_chart(allocation_chart, width="stretch")
+
+elif result:
+    st.warning(f"Optimizer failed: {result['status']}")
+
+else:
+    st.info("Need production and demand data to plan ahead.")
@@ -1,3 +1,5 @@
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -6,31 +8,19 @@ import altair as alt
 
 from infrastructure.firebase_client import init_firebase
 from infrastructure.firestore_repository import FirestoreRepository
-from application.performance_service import PerformanceService
+from application.performance_service import (
+    PerformanceService,
+    RANKING_METRICS,
+    SUMMARY_METRICS,
+)
 from application.round_service import RoundService
+from application.competitor_service import CompetitorService
+from application.elasticity_service import ElasticityService
+from application.strategy_cluster_service import StrategyClusterService
+from application.share_prediction_service import SharePredictionService
+from ui.export_sidebar import render_export_sidebar
 
 
-def sales_weighted_stats(df, metric, weight_col="sales_volume"):
-    if metric not in df.columns or weight_col not in df.columns:
-        return None, None
-
-    values = df[metric].astype(float)
-    weights = df[weight_col].astype(float)
-
-    if weights.sum() == 0:
-        return None, None
-
-    weighted_mean = np.average(values, weights=weights)
-
-    weighted_var = np.average(
-        (values - weighted_mean) ** 2,
-        weights=weights
-    )
-
-    weighted_sd = np.sqrt(weighted_var)
-
-    return weighted_mean, weighted_sd
-
 # =====================================================
 # INIT SERVICE (Singleton per session)
 # =====================================================
@@ -51,6 +41,36 @@ def get_service():
 
 round_service = get_service()
 
+@st.cache_resource
+def get_competitor_service():
+    db = init_firebase()
+    repo = FirestoreRepository(db)
+    return CompetitorService(repo)
+
+competitor_service = get_competitor_service()
+
+@st.cache_resource
+def get_elasticity_service():
+    return ElasticityService()
+
+elasticity_service = get_elasticity_service()
+
+@st.cache_resource
+def get_cluster_service():
+    db = init_firebase()
+    repo = FirestoreRepository(db)
+    return StrategyClusterService(repo)
+
+cluster_service = get_cluster_service()
+
+@st.cache_resource
+def get_prediction_service():
+    db = init_firebase()
+    repo = FirestoreRepository(db)
+    return SharePredictionService(repo)
+
+prediction_service = get_prediction_service()
+
 
 # =====================================================
 # REQUIRE GAME
@@ -63,6 +83,14 @@ game_id = st.session_state["game_id"]
 company_name = st.session_state.get("company_name", "")
 
 
+# =====================================================
+# EXPORT
+# =====================================================
+render_export_sidebar(game_id)
+
+page_started = time.perf_counter()
+
+
 # =====================================================
 # LOAD ALL ROUNDS (ONCE PER GAME)
 # =====================================================
@@ -81,13 +109,19 @@ if not rounds_data:
     st.warning("No data found in this game.")
     st.stop()
 
+# canonical company x round x market frame (market + net profit),
+# built once per game version and shared with the services; every
+# section below reads the same version
+data_version = performance_service.panels.get_version(game_id)
+panel = performance_service.panels.get_panel(game_id, data_version)
+round_index = set(panel.index.get_level_values("round"))
+
 # =====================================================
 # UI CONFIG
 # =====================================================
 round_numbers = sorted(rounds_data.keys())
-round_tabs = st.tabs([f"Round {r}" for r in round_numbers])
 
-metrics_summary = ["Net profit", "revenue", "sales_volume"]
+metrics_summary = SUMMARY_METRICS
 
 columns_to_show = [
     "company",
@@ -98,358 +132,509 @@ columns_to_show = [
     "revenue"
 ]
 
-metrics = [
-    "price",
-    "product_quality",
-    "product_image",
-    "revenue",
-    "sales_volume",
-    "market_share"
-]
+metrics = RANKING_METRICS
+
+
+# =====================================================
+# RANKING CUBES (every round x market x metric in one pass)
+# =====================================================
+df_panel = panel.reset_index()
+
+# summaries, cubes, trend and weighted stats are computed once per
+# (game, data version, company) and warmed after each save, so a
+# rerun (e.g. switching rounds) only looks them up
+tables_started = time.perf_counter()
+
+tables = performance_service.get_ranking_tables(
+    game_id,
+    company_name,
+    data_version
+)
+
+df_summaries = tables["summaries"]
+summary_cube = tables["summary_cube"]
+market_cube = tables["market_cube"]
+trend_table = tables["trend"]
+summary_wstats = tables["summary_wstats"]
+market_wstats = tables["market_wstats"]
+
+# round x market x company arrays of the same version (top 3)
+tensor = performance_service.panels.get_tensor(game_id, data_version)
+
+tables_ms = (time.perf_counter() - tables_started) * 1000
+
+
+def render_weighted(wstats, key):
+
+    if key not in wstats.index:
+        return
+
+    row = wstats.loc[key]
 
+    if row["zero_weight"]:
+        return
+
+    c3, c4 = st.columns(2)
+    c3.metric("Sales Weighted Avg", f"{row['mean']:,.2f}")
+    c4.metric("Sales Weighted Sd", f"{row['sd']:,.2f}")
+
+
+def render_kpis(row, avg_label):
+
+    # KPI ROW 1
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("Leader", row["leader"])
+    k2.metric(avg_label, f"{row['average']:,.2f}")
+    k3.metric("Our Rank", f"{int(row['our_rank'])}/{int(row['n_companies'])}")
+    k4.metric("Our Value", f"{row['our_value']:,.2f}")
+
+    # KPI ROW 2
+    c1, c2 = st.columns(2)
+    c1.metric("Vs Leader", f"{row['pct_vs_leader']:+.2f}%")
+    c2.metric("Vs Avg", f"{row['pct_vs_avg']:+.2f}%")
 
 
 # =====================================================
-# MAIN LOOP
+# ROUND VIEW (only the selected round / market is rendered)
 # =====================================================
-for tab, rnd in zip(round_tabs, round_numbers):
+# st.tabs would execute every round body and every nested market
+# body on each rerun; the round selector renders one round from the
+# cached tables, and the market selector sits in a fragment so
+# switching markets only reruns the market section
+if st.session_state.get("selected_round") not in round_numbers:
+    st.session_state["selected_round"] = round_numbers[-1]
+
+rnd = st.radio(
+    "Round",
+    round_numbers,
+    key="selected_round",
+    format_func=lambda r: f"Round {r}",
+    horizontal=True
+)
+
+
+def render_round_summary(rnd):
+
+    df_summary = (
+        df_summaries[df_summaries["round"] == rnd]
+        .drop(columns="round")
+        .reset_index(drop=True)
+    )
+
+    if df_summary.empty:
+        st.warning("No summary available.")
+        return
+
+    st.subheader("📊 Round Summary")
 
-    with tab:
+    st.dataframe(
+        df_summary.style.format({
+            "Net profit": "{:,.2f}",
+            "revenue": "{:,.2f}",
+            "sales_volume": "{:,.0f}"
+        }),
+        width="stretch"
+    )
 
-        round_doc = rounds_data[rnd]
+    # ================= SUMMARY METRICS =================
+    for metric in metrics_summary:
 
-        if "market_data" not in round_doc:
-            st.warning("No market data.")
+        if (rnd, metric) not in summary_cube.index:
             continue
 
-        df_round = pd.DataFrame(round_doc["market_data"])
+        with st.expander(metric):
 
-        # ---- inject net profit ----
-        if "net_profit" in round_doc:
+            row = summary_cube.loc[(rnd, metric)]
 
-            df_profit = pd.DataFrame(round_doc["net_profit"])
+            if pd.isna(row["our_rank"]):
+                continue
 
-            if not df_profit.empty:
-                df_round = df_round.merge(
-                    df_profit,
-                    on="company",
-                    how="left"
-                )
-        if "price" in df_round.columns and "sales_volume" in df_round.columns:
-            df_round["revenue"] = (
-                df_round["price"] * df_round["sales_volume"]
-            )
-        if df_round.empty:
-            st.warning("Empty dataset.")
-            continue
+            render_kpis(row, "Round Avg")
+            render_weighted(summary_wstats, (rnd, metric))
 
-        # ================= ROUND SUMMARY =================
-        df_summary = performance_service.get_round_summary(df_round)
+            if metric in ["revenue", "sales_volume"]:
+                st.divider()
+                st.metric("🌍 Market Total", f"{row['total']:,.2f}")
 
-        if df_summary.empty:
-            st.warning("No summary available.")
-            continue
 
-        st.subheader("📊 Round Summary")
+@st.fragment
+def render_market_section(rnd):
 
-        st.dataframe(
-            df_summary.style.format({
-                "Net profit": "{:,.2f}",
-                "revenue": "{:,.2f}",
-                "sales_volume": "{:,.0f}"
-            }),
-            width="stretch"
-        )
+    df_round = panel.loc[rnd].reset_index()
 
-        # ================= SUMMARY METRICS =================
-        for metric in metrics_summary:
+    # ================= MARKET LEVEL =================
+    markets = sorted(df_round["market_id"].unique())
 
-            if metric not in df_summary.columns:
+    market_key = f"selected_market_{rnd}"
+    if st.session_state.get(market_key) not in markets:
+        st.session_state[market_key] = markets[0]
+
+    market = st.radio(
+        "Market",
+        markets,
+        key=market_key,
+        format_func=lambda m: f"Market {m}",
+        horizontal=True
+    )
+
+    df_market = df_round[
+        df_round["market_id"] == market
+    ]
+
+    if df_market.empty:
+        st.warning("No market data.")
+        return
+
+    df_show = df_market[columns_to_show]
+
+    st.dataframe(
+        df_show.style.format({
+            "product_quality": "{:.2f}",
+            "product_image": "{:.2f}",
+            "price": "{:.2f}",
+            "sales_volume": "{:,.0f}",
+            "revenue": "{:,.2f}"
+        }),
+        width="stretch"
+    )
+    # ================= MARKET METRICS =================
+    for metric in metrics:
+        if (rnd, market, metric) not in market_cube.index:
+            continue
+
+        with st.expander(metric):
+            row = market_cube.loc[(rnd, market, metric)]
+
+            if pd.isna(row["our_rank"]):
                 continue
 
-            with st.expander(metric):
+            top_companies = performance_service.top_companies(
+                tensor, rnd, market, metric, n=3
+            )
 
-                df_metric = performance_service.compute_metric_table(
-                    df_summary,
-                    metric
-                )
-
-                if df_metric.empty:
-                    continue
-
-                leader = df_metric.iloc[0]
-                market_avg = df_metric[metric].mean()
-                # ===== Sales-weighted mean =====
-                sales_weighted_mean = None
-
-                if "sales_volume" in df_summary.columns:
-                    total_sales = df_summary["sales_volume"].sum()
+            # Display leader and our metrics
+            render_kpis(row, "Market Avg")
 
-                    if total_sales > 0:
-                        sales_weighted_mean = (
-                            (df_summary[metric] * df_summary["sales_volume"]).sum()
-                            / total_sales
-                        )
-
-                
-                # ===== Sales-weighted SD =====
-                sales_weighted_sd = None
+            # Display top 3 companies
+            st.subheader("Top 3 Companies")
+            for index, top in top_companies.iterrows():
+                st.write(f"{top['rank']}: {top['company']} - {top['value']:,.2f}")
 
-                if sales_weighted_mean is not None:
-                    variance = (
-                        (
-                            (df_summary[metric] - sales_weighted_mean) ** 2
-                            * df_summary["sales_volume"]
-                        ).sum()
-                        / total_sales
-                    )
+            render_weighted(market_wstats, (rnd, market, metric))
 
-                    sales_weighted_sd = np.sqrt(variance)
 
-                our_row = df_metric[
-                    df_metric["company"] == company_name
-                ]
-
-                if our_row.empty:
-                    continue
+if rnd not in round_index:
+    st.warning("No market data.")
+else:
+    render_round_summary(rnd)
+    render_market_section(rnd)
 
-                our_row = our_row.iloc[0]
-                our_value = our_row[metric]
-                our_rank = int(our_row["rank"])
-                market_total = df_metric[metric].sum()
-
-
-                pct_vs_leader = (
-                    (our_value - leader[metric]) /
-                    abs(leader[metric]) * 100
-                ) if leader[metric] != 0 else 0
-
-                pct_vs_avg = (
-                    (our_value - market_avg) /
-                    abs(market_avg) * 100
-                ) if market_avg != 0 else 0
-
-                # KPI ROW 1
-                k1, k2, k3, k4 = st.columns(4)
-                k1.metric("Leader", leader["company"])
-                k2.metric("Round Avg", f"{market_avg:,.2f}")
-                k3.metric("Our Rank", f"{our_rank}/{len(df_metric)}")
-                k4.metric("Our Value", f"{our_value:,.2f}")
-
-                # KPI ROW 2
-                c1, c2 = st.columns(2)
-                c1.metric("Vs Leader", f"{pct_vs_leader:+.2f}%")
-                c2.metric("Vs Avg", f"{pct_vs_avg:+.2f}%")
-
-                if metric in ["revenue", "sales_volume"]:
-                    st.divider()
-                    st.metric("🌍 Market Total", f"{market_total:,.2f}")
-
-
-        # ================= MARKET LEVEL =================
-        markets = sorted(df_round["market_id"].unique())
-        market_tabs = st.tabs([f"Market {m}" for m in markets])
-
-        for market_tab, market in zip(market_tabs, markets):
-
-            with market_tab:
-
-                df_market = df_round[
-                    df_round["market_id"] == market
-                ]
-
-                if df_market.empty:
-                    st.warning("No market data.")
-                    continue
-
-                df_show = df_market[columns_to_show]
-
-                st.dataframe(
-                    df_show.style.format({
-                        "product_quality": "{:.2f}",
-                        "product_image": "{:.2f}",
-                        "price": "{:.2f}",
-                        "sales_volume": "{:,.0f}",
-                        "revenue": "{:,.2f}"
-                    }),
-                    width="stretch"
-                )
-                # ================= MARKET METRICS =================
-                for metric in metrics:
-                    if metric not in df_market.columns:
-                        continue
-
-                    with st.expander(metric):
-                        df_metric = performance_service.compute_metric_table(df_market, metric)
-
-                        if df_metric.empty:
-                            continue
-
-                        # Sort by the metric value and get the top 3
-                        top_companies = df_metric.sort_values(by=metric, ascending=False).head(3)
-
-                        # Fetch leader and market average
-                        leader = top_companies.iloc[0]
-                        market_avg = df_metric[metric].mean()
-
-                        our_row = df_metric[df_metric["company"] == company_name]
-
-                        if our_row.empty:
-                            continue
-
-                        our_row = our_row.iloc[0]
-                        our_value = our_row[metric]
-                        our_rank = int(our_row["rank"])
-
-                        pct_vs_leader = (
-                            (our_value - leader[metric]) /
-                            abs(leader[metric]) * 100
-                        ) if leader[metric] != 0 else 0
-
-                        pct_vs_avg = (
-                            (our_value - market_avg) /
-                            abs(market_avg) * 100
-                        ) if market_avg != 0 else 0
-
-                        if "sales_volume" in df_market.columns:
-                            
-                            total_sales = df_market["sales_volume"].sum()
-                            if total_sales > 0:
-                                sales_weighted_mean = (
-                                    (df_market[metric] * df_market["sales_volume"]).sum()
-                                    / total_sales
-                                )
-
-                        
-                        variance = (
-                            (
-                                (df_market[metric] - sales_weighted_mean) ** 2
-                                * df_market["sales_volume"]
-                            ).sum()
-                            / df_market["sales_volume"].sum()
-                        )
-
-                        sales_weighted_sd = np.sqrt(variance)
-                        
-                        # Display leader and our metrics
-                        k1, k2, k3, k4 = st.columns(4)
-                        k1.metric("Leader", leader["company"])
-                        k2.metric("Market Avg", f"{market_avg:,.2f}")
-                        k3.metric("Our Rank", f"{our_rank}/{len(df_metric)}")
-                        k4.metric("Our Value", f"{our_value:,.2f}")
-
-                        c1, c2 = st.columns(2)
-                        c1.metric("Vs Leader", f"{pct_vs_leader:+.2f}%")
-                        c2.metric("Vs Avg", f"{pct_vs_avg:+.2f}%")
-
-                        # Display top 3 companies
-                        st.subheader("Top 3 Companies")
-                        for index, row in top_companies.iterrows():
-                            st.write(f"{row['rank']}: {row['company']} - {row[metric]:,.2f}")
-                        c3, c4 = st.columns(2)
-
-                        if sales_weighted_mean is not None:
-                            c3.metric("Sales Weighted Avg", f"{sales_weighted_mean:,.2f}")
-                            c4.metric("Sales Weighted Sd", f"{sales_weighted_sd:,.2f}")
-
-
-
-# Initialize lists to store all rounds' metric data
-metric_results = {
-    metric: {
-        "rounds": [],
-        "top_company": [],
-        "our_company": []
-    }
-    for metric in metrics
-}
 
-# ================= MAIN LOOP =================
-for tab, rnd in zip(round_tabs, round_numbers):
+# =====================================================
+# COMPETITOR TRAJECTORY
+# =====================================================
+st.divider()
+st.subheader("🕵️ Competitor Trajectory")
 
-    with tab:
-        round_doc = rounds_data[rnd]
+series = competitor_service.get_store(game_id, data_version)
 
-        if "market_data" not in round_doc:
-            st.warning("No market data.")
-            continue
+competitors = [c for c in sorted(series.companies) if c != company_name]
 
-        df_round = pd.DataFrame(round_doc["market_data"])
+if competitors:
 
-        # ---- inject net profit ----
-        if "net_profit" in round_doc:
-            df_profit = pd.DataFrame(round_doc["net_profit"])
-            if not df_profit.empty:
-                df_round = df_round.merge(df_profit, on="company", how="left")
+    c1, c2, c3 = st.columns(3)
+    competitor = c1.selectbox("Competitor", competitors)
+    series_metric = c2.selectbox("Metric", series.metrics)
+    series_market = c3.selectbox(
+        "Market",
+        [None] + sorted(series.markets),
+        format_func=lambda m: "All markets" if m is None else f"Market {m}"
+    )
 
-        if "price" in df_round.columns and "sales_volume" in df_round.columns:
-            df_round["revenue"] = df_round["price"] * df_round["sales_volume"]
+    # company x round table, one slice of the series array
+    df_compare = series.compare(series_metric, market=series_market)
 
-        if df_round.empty:
-            st.warning("Empty dataset.")
-            continue
+    df_lines = (
+        df_compare
+        .reindex([company_name, competitor])
+        .rename_axis("Company")
+        .reset_index()
+        .melt(id_vars="Company", var_name="Round", value_name="Value")
+        .dropna(subset=["Value"])
+    )
 
-        # ===== LOOP PER METRIC =====
-        for metric in metrics:
+    competitor_chart = alt.Chart(df_lines).mark_line(point=True).encode(
+        x=alt.X("Round:O"),
+        y=alt.Y("Value:Q", title=series_metric, scale=alt.Scale(zero=False)),
+        color=alt.Color("Company:N")
+    )
 
-            if metric not in df_round.columns:
-                continue
+    st.altair_chart(competitor_chart, width="stretch")
 
-            df_metric = performance_service.compute_metric_table(df_round, metric)
 
-            if df_metric.empty:
-                continue
+# =====================================================
+# STRATEGY SEGMENTS
+# =====================================================
+st.divider()
+st.subheader("🧩 Strategy Segments")
+
+c1, c2 = st.columns(2)
+n_segments = c1.slider("Segments", min_value=2, max_value=6, value=3)
+
+segments = cluster_service.get_segments(
+    game_id,
+    k=n_segments,
+    version=data_version
+)
+
+df_assign = segments["assignments"]
+
+if not df_assign.empty:
+
+    segment_market = c2.selectbox(
+        "Segment market",
+        sorted(df_assign["market_id"].unique()),
+        format_func=lambda m: f"Market {m}"
+    )
+
+    df_seg = df_assign[
+        (df_assign["round"] == rnd)
+        & (df_assign["market_id"] == segment_market)
+    ]
+
+    segment_chart = alt.Chart(df_seg).mark_circle(size=90).encode(
+        x=alt.X("price:Q", scale=alt.Scale(zero=False)),
+        y=alt.Y("product_quality:Q", scale=alt.Scale(zero=False)),
+        size=alt.Size("product_image:Q"),
+        color=alt.Color("segment:N", title="Segment"),
+        tooltip=["company", "segment", "price", "product_quality", "product_image"]
+    ).properties(
+        title=f"Round {rnd} positioning"
+    )
+
+    st.altair_chart(segment_chart, width="stretch")
+
+    # our segment over the game
+    df_ours = df_assign[
+        (df_assign["company"] == company_name)
+        & (df_assign["market_id"] == segment_market)
+    ]
+
+    if not df_ours.empty:
+        st.dataframe(
+            df_ours.pivot(index="market_id", columns="round", values="segment"),
+            width="stretch"
+        )
 
-            # top company
-            top_company = df_metric.sort_values(by=metric, ascending=False).iloc[0]
+    with st.expander("Segment moves between rounds"):
+        st.dataframe(
+            segments["transitions"][
+                segments["transitions"]["market_id"] == segment_market
+            ],
+            width="stretch",
+            hide_index=True
+        )
 
-            top_value = top_company[metric]
 
-            our_row = df_metric[df_metric["company"] == company_name]
-            our_value = np.nan if our_row.empty else our_row.iloc[0][metric]
+# =====================================================
+# ELASTICITIES
+# =====================================================
+st.divider()
+st.subheader("📐 Share Elasticities")
 
-            # save per metric
-            metric_results[metric]["rounds"].append(rnd)
-            metric_results[metric]["top_company"].append(top_value)
-            metric_results[metric]["our_company"].append(our_value)
-            
-            
-for metric in metrics:
+# every level in one cached call (keyed by a data fingerprint)
+elasticities = elasticity_service.get_elasticities(game_id, df_panel)
 
-    data = metric_results[metric]
+elasticity_format = {
+    "price_elasticity": "{:+.2f}",
+    "quality_elasticity": "{:+.2f}",
+    "image_elasticity": "{:+.2f}",
+    "r2": "{:.2f}",
+}
 
-    if len(data["rounds"]) == 0:
-        continue
+level = st.radio(
+    "Fitted by",
+    ["market", "round", "round_market", "companies"],
+    format_func={
+        "market": "Market",
+        "round": "Round",
+        "round_market": "Round x Market",
+        "companies": "Company (point)",
+    }.get,
+    horizontal=True
+)
+
+df_elasticity = elasticities[level].drop(columns=["const"], errors="ignore")
+
+if level == "companies":
+    df_elasticity = df_elasticity[df_elasticity["round"] == rnd]
+
+st.dataframe(
+    df_elasticity.style.format(elasticity_format),
+    width="stretch",
+    hide_index=True
+)
+
+# ---- how the effects move over the game (O(rounds) paths) ----
+if len(round_numbers) >= 2:
+
+    path_window = st.slider(
+        "Rolling window (rounds)",
+        min_value=2,
+        max_value=max(2, len(round_numbers)),
+        value=min(3, len(round_numbers))
+    )
 
-    line_df = pd.DataFrame({
-    "Round": data["rounds"],
-    "Top Company": data["top_company"],
-    "Our Company": data["our_company"]
-    })
+    df_paths = elasticity_service.get_coefficient_paths(
+        game_id,
+        df_panel,
+        window=path_window
+    )
 
-    line_df.set_index("Round", inplace=True)
+    if not df_paths.empty:
+
+        path_chart = alt.Chart(df_paths).mark_line(point=True).encode(
+            x=alt.X("round:O", title="Round"),
+            y=alt.Y("value:Q", title="Elasticity", scale=alt.Scale(zero=False)),
+            color=alt.Color("coefficient:N", title="Effect"),
+            strokeDash=alt.StrokeDash("window:N", title="Window"),
+            tooltip=["round", "window", "coefficient",
+                     alt.Tooltip("value:Q", format="+.3f")]
+        ).properties(
+            title="Coefficient paths"
+        )
 
-    # interpolate ให้เส้น smooth
-    line_df.interpolate(method="linear", inplace=True)
+        st.altair_chart(path_chart, width="stretch")
 
 
-    plot_df = line_df.reset_index().melt(
-        id_vars="Round",
-        var_name="Company",
-        value_name="Value"
+# =====================================================
+# NEXT-ROUND SHARE PREDICTION
+# =====================================================
+st.divider()
+st.subheader("🔮 Next-Round Share Prediction")
+
+fixed_effects = st.radio(
+    "Model",
+    [True, False],
+    format_func=lambda fe: "Company fixed effects" if fe else "Pooled OLS",
+    horizontal=True
+)
+
+# our last decisions per market, editable as what-if overrides
+our_decisions = prediction_service.latest_decisions(df_panel)
+our_decisions = our_decisions[
+    our_decisions["company"].astype(str) == company_name
+][["company", "market_id", "price", "product_quality", "product_image"]]
+
+overrides = None
+
+if not our_decisions.empty:
+    overrides = st.data_editor(
+        our_decisions,
+        disabled=["company", "market_id"],
+        hide_index=True,
+        key="prediction_overrides"
     )
 
-    chart = alt.Chart(plot_df).mark_line(point=True).encode(
-        x=alt.X("Round:Q", title="Round"),
-        y=alt.Y(
-            "Value:Q",
-            title=metric,
-            scale=alt.Scale(zero=False)  # auto-scale ตามช่วงข้อมูลจริง
-        ),
-        color=alt.Color("Company:N", title="Company")
+df_prediction = prediction_service.predict(
+    game_id,
+    overrides=overrides,
+    fixed_effects=fixed_effects,
+    version=data_version
+)
+
+df_ours = df_prediction[df_prediction["company"].astype(str) == company_name]
+
+if not df_ours.empty:
+    cols = st.columns(len(df_ours))
+    for col, (_, row) in zip(cols, df_ours.iterrows()):
+        col.metric(
+            f"Market {row['market_id']}",
+            f"{row['predicted_share']:.1f}%",
+            delta=f"{row['predicted_share'] - row['last_share']:+.1f} pts"
+        )
+
+with st.expander("All companies"):
+    st.dataframe(
+        df_prediction.drop(columns=["predicted_log_share"]).style.format({
+            "price": "{:,.2f}",
+            "last_share": "{:.1f}",
+            "predicted_share": "{:.1f}",
+        }),
+        width="stretch",
+        hide_index=True
+    )
+
+df_backtest = prediction_service.backtest(
+    game_id,
+    fixed_effects=fixed_effects,
+    version=data_version
+)
+
+if not df_backtest.empty:
+    st.caption("Backtest: fit on earlier rounds, predict each round from its actual decisions")
+    st.dataframe(
+        df_backtest.style.format({
+            "mae_log_share": "{:.3f}",
+            "rmse_log_share": "{:.3f}",
+            "mae_share_pts": "{:.2f}",
+        }),
+        width="stretch",
+        hide_index=True
+    )
+
+
+# =====================================================
+# TRENDS (one faceted chart over the shared trend table)
+# =====================================================
+st.divider()
+
+if not trend_table.empty:
+
+    trend_chart = alt.Chart(trend_table).mark_line(point=True).encode(
+        x=alt.X("round:Q", title="Round"),
+        y=alt.Y("value:Q", title=None, scale=alt.Scale(zero=False)),
+        color=alt.Color("series:N", title="Company"),
+        tooltip=["round", "metric", "series", alt.Tooltip("value:Q", format=",.2f")]
     ).properties(
-        title=f"{metric} Trend"
+        width=280,
+        height=200
+    ).facet(
+        facet=alt.Facet("metric:N", title=None, sort=metrics),
+        columns=2
+    ).resolve_scale(
+        y="independent"
+    ).properties(
+        title="Trends: Top Company vs Our Company"
     )
 
-    st.altair_chart(chart, width='stretch')
-    
\ No newline at end of file
+    st.altair_chart(trend_chart)
+
+
+# =====================================================
+# RERUN TIMING
+# =====================================================
+page_ms = (time.perf_counter() - page_started) * 1000
+
+# both measured: the cold cost of the round / market tables (once
+# per data version) and what reading them cost on this rerun
+compute_ms = tables["compute_ms"]
+cached = tables_ms < compute_ms
+
+with st.sidebar:
+    st.caption("⏱️ Rerun timing")
+    st.metric("This rerun", f"{page_ms:,.0f} ms")
+    st.metric(
+        "Round tables, this rerun",
+        f"{tables_ms:,.1f} ms",
+        delta=(
+            f"{compute_ms - tables_ms:,.0f} ms saved" if cached
+            else "computed now"
+        ),
+        delta_color="off",
+        help=(
+            f"Measured: computing the summaries, ranking cubes, trends "
+            f"and weighted stats took {compute_ms:,.0f} ms for this data "
+            f"version; later reruns read them from the cache."
+        )
+    )
@@ -1,43 +1,71 @@
-from firebase_admin import firestore
+import argparse
+import hashlib
 
 from infrastructure.firebase_client import init_firebase
+from infrastructure.migration import (
+    Migration,
+    MigrationRunner,
+    RenameField,
+    DropField,
+)
 
-db = init_firebase()
-
-SAFETY = 0 
-
-OLD_COLUMNS_NAME = ""
-NEW_COLUMNS_NAME = ""
- 
-games_ref = db.collection("mbs_games")
 
-for game_doc in games_ref.stream():
+# =====================================================
+# CLI
+# =====================================================
+# python rename_field.py --array production \
+#     --rename raw_material_inv raw_material_inventory --dry-run
+parser = argparse.ArgumentParser(
+    description="Rename / drop fields inside a round array of every game"
+)
+parser.add_argument(
+    "--array",
+    default="production",
+    help="market_data | net_profit | production | potential_demand"
+)
+parser.add_argument(
+    "--rename",
+    nargs=2,
+    action="append",
+    default=[],
+    metavar=("OLD", "NEW")
+)
+parser.add_argument("--drop", action="append", default=[])
+parser.add_argument("--name", default=None, help="migration / checkpoint name")
+parser.add_argument("--workers", type=int, default=4)
+parser.add_argument("--batch-size", type=int, default=400)
+parser.add_argument("--checkpoint", default=None)
+parser.add_argument("--dry-run", action="store_true")
 
-    rounds_ref = game_doc.reference.collection("rounds").stream()
+args = parser.parse_args()
 
-    for round_doc in rounds_ref:
-        data = round_doc.to_dict()
+transforms = (
+    [RenameField(old, new) for old, new in args.rename]
+    + [DropField(name) for name in args.drop]
+)
 
-        production_list = data.get("production", [])
+if not transforms:
+    parser.error("nothing to do: pass --rename and/or --drop")
 
-        if not production_list:
-            continue
+# the default name (and so the checkpoint) depends on the transforms:
+# a different rename never resumes from another one's checkpoint
+ops = repr((args.array, args.rename, args.drop)).encode()
 
-        updated = False
-        new_production = []
+migration = Migration(
+    name=args.name or f"{args.array}_{hashlib.sha1(ops).hexdigest()[:8]}",
+    array_field=args.array,
+    transforms=transforms
+)
 
-        for item in production_list:
-
-            if OLD_COLUMNS_NAME in item:
-                item[NEW_COLUMNS_NAME] = item[OLD_COLUMNS_NAME]
-                del item[OLD_COLUMNS_NAME]
-                updated = True
-
-            new_production.append(item)
+db = init_firebase()
 
-        if updated:
-            round_doc.reference.update({
-                "production": new_production
-            })
+report = MigrationRunner(
+    db,
+    migration,
+    workers=args.workers,
+    batch_size=args.batch_size,
+    checkpoint_path=args.checkpoint,
+    dry_run=args.dry_run
+).run()
 
-            print(f"Updated {game_doc.id} / {round_doc.id}")
\ No newline at end of file
+print(report)
@@ -0,0 +1,33 @@
+import streamlit as st
+
+from infrastructure.firebase_client import init_firebase
+from infrastructure.firestore_repository import FirestoreRepository
+from application.export_service import EXPORT_FORMATS, ExportService
+
+
+@st.cache_resource
+def get_export_service():
+    db = init_firebase()
+    repo = FirestoreRepository(db)
+    return ExportService(repo)
+
+
+def render_export_sidebar(game_id: str):
+    """
+    Format picker and download button in the sidebar. The file is
+    built only when the button is clicked.
+    """
+
+    export_service = get_export_service()
+
+    with st.sidebar:
+        st.caption("⬇️ Export game data")
+        export_format = st.selectbox(
+            "Format", list(EXPORT_FORMATS), key="export_format"
+        )
+        st.download_button(
+            "Download",
+            data=lambda: export_service.export_bytes(game_id, export_format),
+            file_name=export_service.file_name(game_id, export_format),
+            mime=export_service.mime(export_format)
+        )